@@ -11,18 +11,24 @@ from ost_utils import network_utils
 from ost_utils.pytest import pytest_collection_modifyitems
 
 from ost_utils.pytest.fixtures.ansible import ansible_all
+from ost_utils.pytest.fixtures.ansible import ansible_async
 from ost_utils.pytest.fixtures.ansible import ansible_by_hostname
 from ost_utils.pytest.fixtures.ansible import ansible_clean_private_dirs
 from ost_utils.pytest.fixtures.ansible import ansible_collect_logs
 from ost_utils.pytest.fixtures.ansible import ansible_engine
 from ost_utils.pytest.fixtures.ansible import ansible_engine_facts
+from ost_utils.pytest.fixtures.ansible import ansible_facts_service
 from ost_utils.pytest.fixtures.ansible import ansible_host0_facts
 from ost_utils.pytest.fixtures.ansible import ansible_host0
 from ost_utils.pytest.fixtures.ansible import ansible_host1
+from ost_utils.pytest.fixtures.ansible import ansible_host1_facts
 from ost_utils.pytest.fixtures.ansible import ansible_hosts
 from ost_utils.pytest.fixtures.ansible import ansible_inventory
+from ost_utils.pytest.fixtures.ansible import ansible_ssh_multiplexing
 from ost_utils.pytest.fixtures.ansible import ansible_storage
 from ost_utils.pytest.fixtures.ansible import ansible_storage_facts
+from ost_utils.pytest.fixtures.ansible import ansible_strategy
+from ost_utils.pytest.fixtures.ansible import ansible_worker_pool
 
 from ost_utils.pytest.fixtures.artifacts import artifacts_dir
 from ost_utils.pytest.fixtures.artifacts import collect_artifacts
@@ -364,13 +364,16 @@ def test_verify_add_hosts(hosts_service, ost_dc_name):
 
 
 @order_by(_TEST_LIST)
-def test_verify_add_all_hosts(hosts_service, ost_dc_name):
+def test_verify_add_all_hosts(hosts_service, ost_dc_name, ansible_host0_facts, ansible_host1_facts):
     assert assert_utils.true_within(
         lambda: host_utils.all_hosts_up(hosts_service, ost_dc_name),
         timeout=constants.ADD_HOST_TIMEOUT,
     )
 
     host_utils.wait_for_flapping_host(hosts_service, ost_dc_name)
+    # the hosts are on the management network's bridge now
+    ansible_host0_facts.refresh()
+    ansible_host1_facts.refresh()
 
 
 @order_by(_TEST_LIST)
@@ -467,11 +470,17 @@ def add_second_nfs_storage_domain(engine_api, hosts_service, sd_nfs_host_storage
     )
 
 
+def _add_over_pooled_connection(engine_api_pool, add_storage_domain, *args):
+    # the storage domains are added in parallel, each over its own connection
+    with engine_api_pool.connection() as engine_api:
+        hosts_service = engine_api.system_service().hosts_service()
+        add_storage_domain(engine_api, hosts_service, *args)
+
+
 @order_by(_TEST_LIST)
 def test_add_secondary_storage_domains(
     master_storage_domain_type,
-    engine_api,
-    hosts_service,
+    engine_api_pool,
     sd_nfs_host_storage_name,
     sd_iscsi_host_luns,
     ost_dc_name,
@@ -480,9 +489,9 @@ def test_add_secondary_storage_domains(
         vt = utils.VectorThread(
             [
                 functools.partial(
+                    _add_over_pooled_connection,
+                    engine_api_pool,
                     add_nfs_storage_domain,
-                    engine_api,
-                    hosts_service,
                     sd_nfs_host_storage_name,
                     ost_dc_name,
                 ),
@@ -492,16 +501,16 @@ def test_add_secondary_storage_domains(
                 #                                  hosts_service, sd_nfs_host_storage_name,
                 #                                  ost_dc_name),
                 functools.partial(
+                    _add_over_pooled_connection,
+                    engine_api_pool,
                     add_templates_storage_domain,
-                    engine_api,
-                    hosts_service,
                     sd_nfs_host_storage_name,
                     ost_dc_name,
                 ),
                 functools.partial(
+                    _add_over_pooled_connection,
+                    engine_api_pool,
                     add_second_nfs_storage_domain,
-                    engine_api,
-                    hosts_service,
                     sd_nfs_host_storage_name,
                     ost_dc_name,
                 ),
@@ -511,9 +520,9 @@ def test_add_secondary_storage_domains(
         vt = utils.VectorThread(
             [
                 functools.partial(
+                    _add_over_pooled_connection,
+                    engine_api_pool,
                     add_iscsi_storage_domain,
-                    engine_api,
-                    hosts_service,
                     sd_iscsi_host_luns,
                     ost_dc_name,
                 ),
@@ -523,16 +532,16 @@ def test_add_secondary_storage_domains(
                 #                                  hosts_service, sd_nfs_host_storage_name,
                 #                                  ost_dc_name),
                 functools.partial(
+                    _add_over_pooled_connection,
+                    engine_api_pool,
                     add_templates_storage_domain,
-                    engine_api,
-                    hosts_service,
                     sd_nfs_host_storage_name,
                     ost_dc_name,
                 ),
                 functools.partial(
+                    _add_over_pooled_connection,
+                    engine_api_pool,
                     add_second_nfs_storage_domain,
-                    engine_api,
-                    hosts_service,
                     sd_nfs_host_storage_name,
                     ost_dc_name,
                 ),
@@ -28,6 +28,7 @@ from ost_utils import engine_utils
 from ost_utils import host_utils
 from ost_utils.shell import shell
 from ost_utils import ssh
+from ost_utils import status_poller as status_poller_lib
 from ost_utils import test_utils
 from ost_utils import utils
 from ost_utils import versioning
@@ -196,12 +197,13 @@ def _verify_vm_state(engine, vm_name, state):
     return vm_service
 
 
-def _verify_vm_disks_state(vm_name, state, get_disk_services_for_vm_or_template, get_vm_service_for_vm):
+def _verify_vm_disks_state(vm_name, state, status_poller, get_vm_service_for_vm):
     vm_service = get_vm_service_for_vm(vm_name)
-    disks_service = get_disk_services_for_vm_or_template(vm_service)
+    disk_ids = [attachment.disk.id for attachment in vm_service.disk_attachments_service().list()]
 
-    for disk_service in disks_service:
-        assert assert_utils.equals_within_short(lambda: disk_service.get().status, state)
+    # all the disks are checked with the same list calls
+    watches = [status_poller.watch('disk', disk_id, status_poller_lib.status_is(state)) for disk_id in disk_ids]
+    assert status_poller.wait_all(watches, assert_utils.SHORT_TIMEOUT), watches
 
 
 @pytest.fixture(scope="session")
@@ -502,15 +504,13 @@ def test_verify_transient_folder(assert_vm_is_alive, engine_api, get_ansible_hos
 
 
 @order_by(_TEST_LIST)
-def test_verify_and_remove_cloned_vm(system_service, get_disk_services_for_vm_or_template, get_vm_service_for_vm):
+def test_verify_and_remove_cloned_vm(system_service, status_poller, get_vm_service_for_vm):
     correlation_id = 'clone_powered_off_vm'
 
     assert assert_utils.true_within_short(lambda: test_utils.all_jobs_finished(system_service, correlation_id))
 
     cloned_vm_service = _verify_vm_state(system_service, CLONED_VM_NAME, types.VmStatus.DOWN)
-    _verify_vm_disks_state(
-        CLONED_VM_NAME, types.DiskStatus.OK, get_disk_services_for_vm_or_template, get_vm_service_for_vm
-    )
+    _verify_vm_disks_state(CLONED_VM_NAME, types.DiskStatus.OK, status_poller, get_vm_service_for_vm)
 
     vm_to_clone_snapshots_service = test_utils.get_vm_snapshots_service(system_service, VM_TO_CLONE_NAME)
     assert assert_utils.equals_within_short(lambda: len(vm_to_clone_snapshots_service.list()), 1)
@@ -953,13 +953,13 @@ def test_add_vm1_from_template(engine_api, cirros_image_template_name, ost_clust
 
 
 @order_by(_TEST_LIST)
-def test_verify_add_vm1_from_template(engine_api, get_disk_services_for_vm_or_template, get_vm_service_for_vm):
+def test_verify_add_vm1_from_template(engine_api, status_poller, get_vm_service_for_vm):
     engine = engine_api.system_service()
     _verify_vm_state(engine, VM1_NAME, types.VmStatus.DOWN)
     _verify_vm_disks_state(
         VM1_NAME,
         types.DiskStatus.OK,
-        get_disk_services_for_vm_or_template,
+        status_poller,
         get_vm_service_for_vm,
     )
 
@@ -1174,12 +1174,10 @@ def test_add_vm_pool(engine_api, cirros_image_template_name, ost_cluster_name):
 
 
 @order_by(_TEST_LIST)
-def test_verify_ovf_import(engine_api, get_disk_services_for_vm_or_template, get_vm_service_for_vm):
+def test_verify_ovf_import(engine_api, status_poller, get_vm_service_for_vm):
     engine = engine_api.system_service()
     _verify_vm_state(engine, OVF_VM_NAME, types.VmStatus.DOWN)
-    _verify_vm_disks_state(
-        OVF_VM_NAME, types.DiskStatus.OK, get_disk_services_for_vm_or_template, get_vm_service_for_vm
-    )
+    _verify_vm_disks_state(OVF_VM_NAME, types.DiskStatus.OK, status_poller, get_vm_service_for_vm)
 
 
 @order_by(_TEST_LIST)
@@ -1211,7 +1209,7 @@ def test_verify_update_template_version(
     engine_api,
     cirros_image_template_name,
     cirros_image_template_version_name,
-    get_disk_services_for_vm_or_template,
+    status_poller,
     get_vm_service_for_vm,
 ):
     engine = engine_api.system_service()
@@ -1226,7 +1224,7 @@ def test_verify_update_template_version(
     vm_service = test_utils.get_vm_service(engine, vm_name)
     assert assert_utils.equals_within_long(lambda: vm_service.get().template.id, template_version.id)
     _verify_vm_state(engine, vm_name, types.VmStatus.DOWN)
-    _verify_vm_disks_state(vm_name, types.DiskStatus.OK, get_disk_services_for_vm_or_template, get_vm_service_for_vm)
+    _verify_vm_disks_state(vm_name, types.DiskStatus.OK, status_poller, get_vm_service_for_vm)
 
 
 @order_by(_TEST_LIST)
@@ -6,6 +6,8 @@ import pytest
 pytest.register_assert_rewrite('ost_utils')
 
 from ost_utils.pytest import pytest_addoption
+from ost_utils.pytest import pytest_configure
+from ost_utils.pytest import pytest_runtest_makereport
 
 
 from ost_utils.pytest import pytest_fixture_setup
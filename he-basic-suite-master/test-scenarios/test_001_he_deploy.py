@@ -64,6 +64,7 @@ def test_he_deploy(
     root_dir,
     suite,
     ansible_host0,
+    ansible_host0_facts,
     ansible_storage,
     he_host_name,
     he_mac_address,
@@ -79,6 +80,8 @@ def test_he_deploy(
     ansible_host0.copy(src=setup_file_src, dest='/root/', mode='preserve')
 
     ansible_host0.shell('/root/setup_first_he_host.sh ' f'{he_host_name} ' f'{he_mac_address} ' f'{engine_ip}')
+    # the deployment moved the host onto the management network's bridge
+    ansible_host0_facts.refresh()
 
     ansible_storage.shell('fstrim -va')
 
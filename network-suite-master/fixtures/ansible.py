@@ -10,6 +10,9 @@ from testlib import address_family
 from ost_utils import ansible
 from ost_utils.ansible import private_dir
 
+# MachineFacts only needs hostnames and addresses
+_MACHINE_FACTS_SUBSET = ('network',)
+
 
 @pytest.fixture(scope="session")
 def af(tested_ip_version):
@@ -18,22 +21,22 @@ def af(tested_ip_version):
 
 @pytest.fixture(scope="session")
 def engine_facts(ansible_engine_facts, af):
-    return _machine_facts(ansible_engine_facts.get_all(), af)
+    return _machine_facts(ansible_engine_facts.get_all(gather_subset=_MACHINE_FACTS_SUBSET), af)
 
 
 @pytest.fixture(scope="session")
 def host0_facts(ansible_host0_facts, af):
-    return _machine_facts(ansible_host0_facts.get_all(), af)
+    return _machine_facts(ansible_host0_facts.get_all(gather_subset=_MACHINE_FACTS_SUBSET), af)
 
 
 @pytest.fixture(scope="session")
 def host1_facts(ansible_host1_facts, af):
-    return _machine_facts(ansible_host1_facts.get_all(), af)
+    return _machine_facts(ansible_host1_facts.get_all(gather_subset=_MACHINE_FACTS_SUBSET), af)
 
 
 @pytest.fixture(scope="session")
 def storage_facts(ansible_storage_facts, af):
-    return _machine_facts(ansible_storage_facts.get_all(), af)
+    return _machine_facts(ansible_storage_facts.get_all(gather_subset=_MACHINE_FACTS_SUBSET), af)
 
 
 @pytest.fixture(scope="session")
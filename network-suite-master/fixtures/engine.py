@@ -13,6 +13,8 @@ from ovirtlib import joblib
 from ovirtlib import sshlib
 from ovirtlib import syncutil
 
+from ost_utils import http_capture
+
 
 @pytest.fixture(scope="session")
 def engine_password():
@@ -75,12 +77,11 @@ def ovirt_engine_service_up(ovirt_engine_setup, engine_facts, engine_full_userna
 
 def _create_engine_connection(ip, engine_username, engine_password):
     url = 'https://{}/ovirt-engine/api'.format(ip)
-    conn = Connection(
+    conn = http_capture.connect(
         url=url,
         username=engine_username,
         password=engine_password,
         insecure=True,
-        debug=True,
     )
     if conn.test():
         return conn
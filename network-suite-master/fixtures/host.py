@@ -21,8 +21,10 @@ def host_0(system, default_cluster, host0_facts):
 
 
 @pytest.fixture(scope='session')
-def host_0_up(system, host_0):
+def host_0_up(system, host_0, ansible_host0_facts):
     _wait_for_host_install(system, host_0)
+    # installed, the host is on the management network's bridge now
+    ansible_host0_facts.refresh()
     return host_0
 
 
@@ -32,8 +34,9 @@ def host_1(system, default_cluster, host1_facts):
 
 
 @pytest.fixture(scope='session')
-def host_1_up(system, host_1):
+def host_1_up(system, host_1, ansible_host1_facts):
     _wait_for_host_install(system, host_1)
+    ansible_host1_facts.refresh()
     return host_1
 
 
@@ -3,13 +3,31 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 #
 #
+import logging
+import os
+
 import pytest
 
+from ovirtlib import syncutil
 from ovirtlib.system import SDKSystemRoot
 
+LOGGER = logging.getLogger(__name__)
+
 
 @pytest.fixture(scope='session')
 def system(api):
     sdk_system = SDKSystemRoot()
     sdk_system.import_conn(api)
     return sdk_system
+
+
+@pytest.fixture(scope='session', autouse=True)
+def sync_metrics(request, artifacts_dir):
+    syncutil.set_buffered_audit(request.config.getoption('--buffered-sync-audit'))
+    yield syncutil.METRICS
+    report = syncutil.METRICS.report()
+    LOGGER.debug(f'syncutil.sync metrics:\n{report}')
+    os.makedirs(artifacts_dir, exist_ok=True)
+    with open(os.path.join(artifacts_dir, 'sync_metrics.txt'), 'w') as report_file:
+        report_file.write(report)
+        report_file.write('\n')
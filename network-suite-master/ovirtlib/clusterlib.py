@@ -92,7 +92,7 @@ class MacPool(SDKRootEntity):
 class Cluster(SDKRootEntity):
     @property
     def name(self):
-        return self.get_sdk_type().name
+        return self.last_sdk_type().name
 
     def create(self, data_center, cluster_name):
         sdk_type = types.Cluster(name=cluster_name, data_center=data_center.get_sdk_type())
@@ -114,12 +114,7 @@ class Cluster(SDKRootEntity):
         return dc
 
     def networks(self):
-        networks = []
-        for sdk_net in self._service.networks_service().list():
-            cluster_network = ClusterNetwork(self)
-            cluster_network.import_by_id(sdk_net.id)
-            networks.append(cluster_network)
-        return networks
+        return ClusterNetwork.from_sdk_types(self, self._service.networks_service().list())
 
     def host_ids(self):
         return [sdk_host.id for sdk_host in self.system.hosts_service.list() if sdk_host.cluster.id == self.id]
@@ -162,10 +157,7 @@ class Cluster(SDKRootEntity):
 
     @staticmethod
     def iterate(system):
-        for sdk_obj in system.clusters_service.list():
-            cluster = Cluster(system)
-            cluster.import_by_id(sdk_obj.id)
-            yield cluster
+        yield from Cluster.from_sdk_types(system, system.clusters_service.list())
 
     def __repr__(self):
         return self._execute_without_raising(
@@ -189,7 +181,7 @@ class ClusterNetwork(SDKSubEntity):
 
         self._parent_service.add(sdk_type)
         service = self._parent_service.service(dc_network.id)
-        self._set_service(service)
+        self._set_service(service, dc_network.id)
 
     def _get_parent_service(self, cluster):
         return cluster.service.networks_service()
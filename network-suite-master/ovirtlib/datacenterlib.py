@@ -18,7 +18,7 @@ from .sdkentity import SDKRootEntity
 class DataCenter(SDKRootEntity):
     @property
     def name(self):
-        return self.get_sdk_type().name
+        return self.last_sdk_type().name
 
     @property
     def status(self):
@@ -39,12 +39,7 @@ class DataCenter(SDKRootEntity):
         )
 
     def list_qos(self):
-        qos_entities = []
-        for qos in self._service.qoss_service().list():
-            qos_entity = netlib.QoS(self)
-            qos_entity.import_by_name(name=qos.name)
-            qos_entities.append(qos_entity)
-        return qos_entities
+        return netlib.QoS.from_sdk_types(self, self._service.qoss_service().list())
 
     def remove_qos(self, qos_names):
         for qos in self.list_qos():
@@ -100,10 +95,7 @@ class DataCenter(SDKRootEntity):
         `search` should be a search query string understood by oVirt.
         Cf. http://ovirt.github.io/ovirt-engine-api-model/master/#_searching
         """
-        for sdk_obj in system.data_centers_service.list(search=search):
-            dc = DataCenter(system)
-            dc.import_by_id(sdk_obj.id)
-            yield dc
+        yield from DataCenter.from_sdk_types(system, system.data_centers_service.list(search=search))
 
     def __repr__(self):
         return self._execute_without_raising(
@@ -53,11 +53,11 @@ class Host(SDKRootEntity):
 
     @property
     def name(self):
-        return self.get_sdk_type().name
+        return self.last_sdk_type().name
 
     @property
     def address(self):
-        return self.get_sdk_type().address
+        return self.last_sdk_type().address
 
     @property
     def root_password(self):
@@ -89,13 +89,8 @@ class Host(SDKRootEntity):
 
     @property
     def bonds(self):
-        bonds = []
-        for sdk_nic in self._service.nics_service().list():
-            if sdk_nic.bonding:
-                bond = Bond(self)
-                bond.import_by_id(sdk_nic.id)
-                bonds.append(bond)
-        return bonds
+        sdk_nics = self._service.nics_service().list()
+        return Bond.from_sdk_types(self, (sdk_nic for sdk_nic in sdk_nics if sdk_nic.bonding))
 
     def create(self, cluster, name, address, root_password):
         """
@@ -321,7 +316,7 @@ class Host(SDKRootEntity):
         self.service.setup_networks(removed_network_attachments=removed_attachments)
 
     def clean_bonds(self):
-        removed_bonds = [bond.get_sdk_type() for bond in self.bonds]
+        removed_bonds = [bond.last_sdk_type() for bond in self.bonds]
         self.service.setup_networks(removed_bonds=removed_bonds)
 
     def sync_all_networks(self):
@@ -461,12 +456,7 @@ class Host(SDKRootEntity):
         return next(filter(lambda nic: nic.mac_address == mac_address, self.nics()))
 
     def nics(self):
-        nics = []
-        for sdk_nic in self._service.nics_service().list():
-            nic = HostNic(self)
-            nic.import_by_id(sdk_nic.id)
-            nics.append(nic)
-        return nics
+        return HostNic.from_sdk_types(self, self._service.nics_service().list())
 
     def __repr__(self):
         return self._execute_without_raising(
@@ -511,7 +501,7 @@ class HostNic(SDKSubEntity):
 
     @property
     def name(self):
-        return self.get_sdk_type().name
+        return self.last_sdk_type().name
 
     @property
     def status(self):
@@ -519,7 +509,7 @@ class HostNic(SDKSubEntity):
 
     @property
     def mac_address(self):
-        return self.get_sdk_type().mac.address
+        return self.last_sdk_type().mac.address
 
     @property
     def boot_protocol(self):
@@ -596,26 +586,30 @@ class Bond(HostNic):
     @property
     def active_slave(self):
         active_slave = self._updated_bonding().active_slave
-        return self._to_nic(active_slave)
+        return self._to_nics([active_slave])[0]
 
     @property
     def inactive_slaves(self):
         bonding = self._updated_bonding()
         inactive_slaves = [inactive for inactive in bonding.slaves if inactive.id != bonding.active_slave.id]
-        return [self._to_nic(nic) for nic in inactive_slaves]
+        return self._to_nics(inactive_slaves)
 
     @property
     def all_slaves(self):
-        return self.inactive_slaves + [self.active_slave]
+        bonding = self._updated_bonding()
+        inactive_slaves = [inactive for inactive in bonding.slaves if inactive.id != bonding.active_slave.id]
+        return self._to_nics(inactive_slaves + [bonding.active_slave])
 
     @property
     def bonding_data(self):
         return netattachlib.BondingData(self.name, [nic.name for nic in self.all_slaves])
 
-    def _to_nic(self, sdk_nic):
-        nic = HostNic(self._parent_sdk_entity)
-        nic.import_by_id(sdk_nic.id)
-        return nic
+    def _to_nics(self, sdk_nics):
+        # the bonding only links the slaves, list the host nics once
+        # instead of getting each of them
+        slave_ids = [sdk_nic.id for sdk_nic in sdk_nics]
+        host_nics = {sdk_nic.id: sdk_nic for sdk_nic in self._parent_service.list()}
+        return HostNic.from_sdk_types(self._parent_sdk_entity, (host_nics[slave_id] for slave_id in slave_ids))
 
     def _updated_bonding(self):
         return self.get_sdk_type().bonding
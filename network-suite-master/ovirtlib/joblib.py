@@ -9,6 +9,12 @@ from . import eventlib
 from . import syncutil
 from .sdkentity import SDKRootEntity
 
+# jobs are filtered by status on the engine side, so finished jobs, which
+# pile up during a run, are never fetched again. The statuses below are
+# the ones excluded from the search.
+_FINISHED_STATUSES = (JobStatus.FINISHED, JobStatus.FAILED, JobStatus.ABORTED)
+_NOT_FAILED_STATUSES = (JobStatus.FINISHED, JobStatus.STARTED)
+
 
 class EngineJobs(SDKRootEntity):
     def __init__(self, parent_sdk_system, job_description_predicate):
@@ -19,45 +25,49 @@ class EngineJobs(SDKRootEntity):
         return system.jobs_service
 
     def list(self):
-        return [
-            job
-            for job in self._parent_service.list()
-            if self._job_description_predicate(job.description) and 'Adding an External Event' not in job.description
-        ]
+        return self._search()
 
     def describe_started(self):
-        started = self._list_for_status((JobStatus.STARTED,))
+        started = [job for job in self._unfinished() if job.status == JobStatus.STARTED]
         return [job.description for job in started]
 
     def describe_ill_fated(self):
-        ill_fated = self._list_for_status((JobStatus.ABORTED, JobStatus.UNKNOWN, JobStatus.FAILED))
+        ill_fated = self._search(excluded_statuses=_NOT_FAILED_STATUSES)
         return [f'{job.description}:{job.status}' for job in ill_fated]
 
     def done(self):
-        return not self._list_for_status((JobStatus.STARTED, JobStatus.UNKNOWN))
+        return not self._unfinished()
 
     def wait_for_done(self):
-        self._report_started()
+        unfinished = self._unfinished()
+        self._report_started(unfinished)
         # there is a small window for TOCTTOU error here
-        if not self.done():
-            syncutil.sync(
-                exec_func=lambda: self.done,
+        if unfinished:
+            unfinished = syncutil.sync(
+                exec_func=self._unfinished,
                 exec_func_args=(),
-                success_criteria=lambda done: done,
+                success_criteria=lambda jobs: not jobs,
             )
-            self._report_started()
+            self._report_started(unfinished)
             self._report_ill_fated()
 
-    def _report_started(self):
-        eventlib.EngineEvents(self.system).add(
-            f'OST - jobs: on wait for done - started jobs: ' f'{self.describe_started()} '
-        )
+    def _report_started(self, unfinished):
+        started = [job.description for job in unfinished if job.status == JobStatus.STARTED]
+        eventlib.EngineEvents(self.system).add(f'OST - jobs: on wait for done - started jobs: ' f'{started} ')
 
     def _report_ill_fated(self):
         eventlib.EngineEvents(self.system).add(f'OST - jobs: on wait for done:' f'{self.describe_ill_fated()}')
 
-    def _list_for_status(self, job_statuses):
-        return [job for job in self.list() if job.status in job_statuses]
+    def _unfinished(self):
+        return self._search(excluded_statuses=_FINISHED_STATUSES)
+
+    def _search(self, excluded_statuses=()):
+        search = ' and '.join(f'status!={status.value}' for status in excluded_statuses) or None
+        return [
+            job
+            for job in self._parent_service.list(search=search)
+            if self._job_description_predicate(job.description) and 'Adding an External Event' not in job.description
+        ]
 
 
 class AllJobs(EngineJobs):
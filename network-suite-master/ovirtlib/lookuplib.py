@@ -0,0 +1,37 @@
+#
+# Copyright oVirt Authors
+# SPDX-License-Identifier: GPL-2.0-or-later
+#
+import functools
+import inspect
+
+
+@functools.lru_cache(maxsize=None)
+def _list_supports_search(service_class):
+    return 'search' in inspect.signature(service_class.list).parameters
+
+
+def supports_search(collection_service):
+    return _list_supports_search(type(collection_service))
+
+
+def search_by_name(collection_service, name, query=None):
+    """Returns the entities named 'name' in a collection that supports search"""
+    if '"' in name:
+        raise ValueError('Quotation marks can not appear in search phrases')
+    entities = collection_service.list(search=f'name="{name}"', query=query)
+    # the search is case insensitive
+    return [entity for entity in entities if entity.name == name]
+
+
+def find_id(collection_service, name, query=None):
+    """
+    Returns the id of the entity named 'name' in the collection, or None
+    Collections that support it are searched, the others listed.
+    :param query: extra query parameters of the listing, i.e. unregistered
+    """
+    if supports_search(collection_service):
+        entities = search_by_name(collection_service, name, query)
+    else:
+        entities = (entity for entity in collection_service.list(query=query) if entity.name == name)
+    return next((entity.id for entity in entities), None)
@@ -47,7 +47,7 @@ class VnicInterfaceType(object):
 class Network(SDKSubEntity):
     @property
     def name(self):
-        return self.get_sdk_type().name
+        return self.last_sdk_type().name
 
     def create(
         self,
@@ -143,7 +143,7 @@ class Network(SDKSubEntity):
 class VnicProfile(SDKRootEntity):
     @property
     def name(self):
-        return self.get_sdk_type().name
+        return self.last_sdk_type().name
 
     def create(self, name, network, qos=None):
         qos_type = None if qos is None else qos.get_sdk_type()
@@ -170,22 +170,19 @@ class VnicProfile(SDKRootEntity):
 
     @staticmethod
     def iterate(system):
-        for sdk_obj in system.vnic_profiles_service.list():
-            profile = VnicProfile(system)
-            profile.import_by_id(sdk_obj.id)
-            yield profile
+        yield from VnicProfile.from_sdk_types(system, system.vnic_profiles_service.list())
 
     @property
     def custom_properties(self):
-        sdk_custom_properties = self.service.get().custom_properties or []
+        sdk_custom_properties = self.get_sdk_type().custom_properties or []
 
         return [CustomProperty(p.name, p.value) for p in sdk_custom_properties]
 
     @custom_properties.setter
     def custom_properties(self, properties):
-        service = self.service.get()
-        service.custom_properties = [types.CustomProperty(name=p.name, value=p.value) for p in properties]
-        self.service.update(service)
+        sdk_type = self.get_sdk_type()
+        sdk_type.custom_properties = [types.CustomProperty(name=p.name, value=p.value) for p in properties]
+        self._update_sdk_type(sdk_type)
 
     def __repr__(self):
         return self._execute_without_raising(
@@ -202,7 +199,7 @@ class VnicProfile(SDKRootEntity):
 class Vnic(SDKSubEntity):
     @property
     def name(self):
-        return self.get_sdk_type().name
+        return self.last_sdk_type().name
 
     @property
     def plugged(self):
@@ -216,17 +213,17 @@ class Vnic(SDKSubEntity):
     def linked(self, linked):
         sdk_type = self.get_sdk_type()
         sdk_type.linked = linked
-        self._service.update(sdk_type)
+        self._update_sdk_type(sdk_type)
 
     @property
     def mac_address(self):
-        return self.get_sdk_type().mac.address
+        return self.last_sdk_type().mac.address
 
     @mac_address.setter
     def mac_address(self, address):
         sdk_type = self.get_sdk_type()
         sdk_type.mac.address = address
-        self._service.update(sdk_type)
+        self._update_sdk_type(sdk_type)
 
     def create(
         self,
@@ -305,7 +302,7 @@ class Vnic(SDKSubEntity):
         if sdk_nic.vnic_profile is None:
             sdk_nic.vnic_profile = new_profile.get_sdk_type()
         sdk_nic.vnic_profile.id = new_profile.id
-        self.service.update(sdk_nic)
+        self._update_sdk_type(sdk_nic)
 
     def __repr__(self):
         return self._execute_without_raising(
@@ -324,7 +321,7 @@ class Vnic(SDKSubEntity):
 class NetworkFilter(SDKRootEntity):
     @property
     def name(self):
-        return self.get_sdk_type().name
+        return self.last_sdk_type().name
 
     def _get_parent_service(self, system):
         return system.network_filters_service
@@ -339,7 +336,7 @@ class NetworkFilter(SDKRootEntity):
 class QoS(SDKSubEntity):
     @property
     def name(self):
-        return self.get_sdk_type().name
+        return self.last_sdk_type().name
 
     def create(
         self,
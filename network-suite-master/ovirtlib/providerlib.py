@@ -40,12 +40,12 @@ class OpenStackNetworkProvider(SDKRootEntity):
     @contextmanager
     def disable_auto_sync(self):
         orig_auto_sync = self.service.get().auto_sync
-        self.service.update(types.OpenStackNetworkProvider(auto_sync=False))
+        self._update_sdk_type(types.OpenStackNetworkProvider(auto_sync=False))
         try:
             yield
         finally:
             if orig_auto_sync:
-                self.service.update(types.OpenStackNetworkProvider(auto_sync=orig_auto_sync))
+                self._update_sdk_type(types.OpenStackNetworkProvider(auto_sync=orig_auto_sync))
 
 
 class OpenStackNetwork(SDKSubEntity):
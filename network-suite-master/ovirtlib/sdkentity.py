@@ -4,9 +4,13 @@
 #
 #
 import abc
+import contextlib
+import time
 
 import ovirtsdk4
 
+from . import lookuplib
+
 
 class EntityAlreadyInitialized(Exception):
     pass
@@ -21,14 +25,35 @@ class EntityCreationError(Exception):
 
 
 class SDKEntity(metaclass=abc.ABCMeta):
+    """
+    Entities keep a snapshot of the sdk type they were last got as. Fields
+    that only change through the entity itself (id, name, mac address)
+    are read from the snapshot, see last_sdk_type. Everything else is got
+    fresh on every read, unless the snapshot is younger than 'max_age'
+    seconds or the entity is inside a 'snapshot()' block:
+
+        with host.snapshot():
+            LOGGER.info(f'{host.name} is {host.status}, spm: {host.is_spm}')
+
+    gets the host once. update() and remove() drop the snapshot.
+    """
+
+    max_age = 0
+
     def __init__(self):
         self._service = None
         self._parent_service = None
         self._parent_sdk_system = None
+        self._id = None
+        self._snapshot = None
+        self._snapshot_time = None
+        self._pinned = 0
 
     @property
     def id(self):
-        return self._service.get().id
+        if self._id is None:
+            self._id = self.last_sdk_type().id
+        return self._id
 
     @property
     def service(self):
@@ -38,8 +63,37 @@ class SDKEntity(metaclass=abc.ABCMeta):
     def system(self):
         return self._parent_sdk_system
 
-    def get_sdk_type(self):
-        return self._service.get()
+    def get_sdk_type(self, max_age=None):
+        """
+        :param max_age: seconds the snapshot may be reused for, defaults
+         to the entity's max_age
+        """
+        max_age = self.max_age if max_age is None else max_age
+        if self._snapshot is not None:
+            if self._pinned or time.monotonic() - self._snapshot_time < max_age:
+                return self._snapshot
+        return self.refresh()
+
+    def last_sdk_type(self):
+        """Returns the snapshot, whatever its age, getting one only if there's none"""
+        if self._snapshot is None:
+            return self.refresh()
+        return self._snapshot
+
+    def refresh(self):
+        self._take_snapshot(self._service.get())
+        return self._snapshot
+
+    @contextlib.contextmanager
+    def snapshot(self):
+        """All reads within the block are served from a single get"""
+        if not self._pinned:
+            self.get_sdk_type()
+        self._pinned += 1
+        try:
+            yield self._snapshot
+        finally:
+            self._pinned -= 1
 
     def create(self, *args, **kwargs):
         """This method is responsible for creating and
@@ -48,43 +102,71 @@ class SDKEntity(metaclass=abc.ABCMeta):
         raise NotImplementedError('not implemented yet')
 
     def import_by_name(self, name):
-        entities = (entity for entity in self._parent_service.list() if entity.name == name)
-        try:
-            entity_id = next(entities).id
-        except StopIteration:
+        entity_id = lookuplib.find_id(self._parent_service, name)
+        if entity_id is None:
             raise EntityNotFoundError('entity "{}" was not found.'.format(name))
         service = self._parent_service.service(entity_id)
-        self._set_service(service)
+        self._set_service(service, entity_id)
 
     def import_by_id(self, entity_id):
         service = self._parent_service.service(entity_id)
-        self._set_service(service)
+        self._set_service(service, entity_id)
+
+    def import_sdk_type(self, sdk_type):
+        """Imports the entity listed as 'sdk_type', which becomes its snapshot"""
+        self.import_by_id(sdk_type.id)
+        self._take_snapshot(sdk_type)
+
+    @staticmethod
+    def _import_sdk_types(new_entity, sdk_types):
+        """Builds entities out of a list response without getting them again"""
+        entities = []
+        for sdk_type in sdk_types:
+            entity = new_entity()
+            entity.import_sdk_type(sdk_type)
+            entities.append(entity)
+        return entities
 
     def remove(self):
+        self._drop_snapshot()
         self._service.remove()
 
     def update(self, **kwargs):
         sdk_type = self.get_sdk_type()
         for key, value in kwargs.items():
             setattr(sdk_type, key, value)
+        return self._update_sdk_type(sdk_type)
+
+    def _update_sdk_type(self, sdk_type):
+        self._drop_snapshot()
         return self._service.update(sdk_type)
 
+    def _take_snapshot(self, sdk_type):
+        self._snapshot = sdk_type
+        self._snapshot_time = time.monotonic()
+
+    def _drop_snapshot(self):
+        self._snapshot = None
+        self._snapshot_time = None
+
     def _create_sdk_entity(self, sdk_type):
         try:
             entity_id = self._parent_service.add(sdk_type).id
         except ovirtsdk4.Error as err:
             raise EntityCreationError(err.args[0])
         service = self._parent_service.service(entity_id)
-        self._set_service(service)
+        self._set_service(service, entity_id)
 
-    def _set_service(self, service):
+    def _set_service(self, service, entity_id=None):
         if self._service is not None:
             raise EntityAlreadyInitialized
         self._service = service
+        self._id = entity_id
 
     def _execute_without_raising(self, func):
         try:
-            return func()
+            with self.snapshot():
+                return func()
         except Exception as e:
             return f'<{self.__class__.__name__}, ' f'{func.__name__} failed with: {str(e)}>'
 
@@ -95,6 +177,10 @@ class SDKRootEntity(SDKEntity, metaclass=abc.ABCMeta):
         self._parent_sdk_system = parent_sdk_system
         self._parent_service = self._get_parent_service(parent_sdk_system)
 
+    @classmethod
+    def from_sdk_types(cls, parent_sdk_system, sdk_types):
+        return cls._import_sdk_types(lambda: cls(parent_sdk_system), sdk_types)
+
     @abc.abstractmethod
     def _get_parent_service(self, sdk_system):
         """
@@ -111,6 +197,10 @@ class SDKSubEntity(SDKEntity, metaclass=abc.ABCMeta):
         self._parent_sdk_entity = parent_sdk_entity
         self._parent_service = self._get_parent_service(parent_sdk_entity)
 
+    @classmethod
+    def from_sdk_types(cls, parent_sdk_entity, sdk_types):
+        return cls._import_sdk_types(lambda: cls(parent_sdk_entity), sdk_types)
+
     @abc.abstractmethod
     def _get_parent_service(self, parent_entity):
         """
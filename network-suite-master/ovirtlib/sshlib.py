@@ -2,8 +2,16 @@
 # Copyright oVirt Authors
 # SPDX-License-Identifier: GPL-2.0-or-later
 #
+import collections
+import concurrent.futures
 import ipaddress
 import logging
+import os
+import shlex
+import socket
+import threading
+import weakref
+
 import paramiko
 import pytest
 
@@ -11,10 +19,19 @@ from . import syncutil
 
 DEFAULT_USER = 'root'
 ROOT_PASSWORD = '123456'
+SFTP_MAX_TRANSFERS = 4
+SFTP_WINDOW_SIZE = 64 * 1024 * 1024
+SFTP_CHUNK_SIZE = 1024 * 1024
+# a transport that looks active may still be dead, opening a session on it
+# would block for paramiko's default of an hour
+SESSION_OPEN_TIMEOUT = 30
 LOGGER = logging.getLogger(__name__)
 logging.getLogger('paramiko.transport').setLevel(logging.WARNING)
 
 
+_CONNECTION_ERRORS = (paramiko.SSHException, EOFError, socket.error)
+
+
 class SshException(Exception):
     pass
 
@@ -23,19 +40,27 @@ class Node(object):
     """
     A class to collect operations that need to be carried out on a node (host
     or VM) but are not supported by the corresponding oVirt objects.
+
+    The ssh session is opened on first use and kept open for the following
+    commands. It is reopened if it breaks, and closed with 'close', when
+    leaving a 'with' block or when the node is garbage collected.
     """
 
-    def __init__(self, address, password=ROOT_PASSWORD, username=DEFAULT_USER):
+    def __init__(self, address, password=ROOT_PASSWORD, username=DEFAULT_USER, compress=False):
         """
         :param address: address of the endpoint
         :param password: the password
         :param username: the username, root if not specified
+        :param compress: compress the ssh traffic, worth it for big
+         transfers of compressible files over slow links
         """
         self._address = address
         self._username = username
         self._password = password
-        self._client = paramiko.SSHClient()
-        self._client.set_missing_host_key_policy(paramiko.WarningPolicy())
+        self._compress = compress
+        self._client = None
+        self._finalizer = None
+        self._lock = threading.Lock()
 
     def exec_command(self, command):
         """
@@ -44,37 +69,106 @@ class Node(object):
         :returns stdout: the standard output of the command
         :raises exc: Exception: if the command returns a non-zero exit status
         """
-        self._connect()
-        try:
-            _, stdout, stderr = self._client.exec_command(command)
-            status = stdout.channel.recv_exit_status()
-            stdout_message = stdout.read()
-            if status != 0:
-                stderr_message = stderr.read()
-                raise SshException(
-                    f'Ssh command "{command}" exited with '
-                    f'status code {status}. '
-                    f'Stderr: {stderr_message}. '
-                    f'Stdout: {stdout_message}. '
-                )
-            return stdout_message
-        finally:
-            self._close()
+        stdout, stderr = self._with_session(lambda channel: _exec_on_channel(channel, command))
+        status = stdout.channel.recv_exit_status()
+        stdout_message = stdout.read()
+        if status != 0:
+            stderr_message = stderr.read()
+            raise SshException(
+                f'Ssh command "{command}" exited with '
+                f'status code {status}. '
+                f'Stderr: {stderr_message}. '
+                f'Stdout: {stdout_message}. '
+            )
+        return stdout_message
+
+    def sftp_put(self, local_path, remote_path, resume=False):
+        self.sftp_put_many([(local_path, remote_path)], resume=resume)
+
+    def sftp_put_many(self, files, max_transfers=SFTP_MAX_TRANSFERS, resume=False):
+        """
+        Copy local files to the node, several of them at a time
+        :param files: (local path, remote path) pairs
+        :param max_transfers: how many files may be in flight at once
+        :param resume: continue copying files that were copied partially,
+         going by their size
+        """
+        self._sftp_many(_put_file, files, max_transfers, resume)
+
+    def sftp_get_many(self, files, max_transfers=SFTP_MAX_TRANSFERS, resume=False):
+        """
+        Copy files from the node, several of them at a time
+        :param files: (remote path, local path) pairs
+        :param max_transfers: how many files may be in flight at once
+        :param resume: continue copying files that were copied partially,
+         going by their size
+        """
+        self._sftp_many(_get_file, files, max_transfers, resume)
+
+    def _sftp_many(self, transfer, files, max_transfers, resume):
+        files = list(files)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(min(max_transfers, len(files)), 1)) as executor:
+            futures = [
+                executor.submit(self._sftp_transfer, transfer, source, destination, resume)
+                for source, destination in files
+            ]
+        for future in futures:
+            future.result()
 
-    def sftp_put(self, local_path, remote_path):
-        self._connect()
-        sftp = paramiko.SFTPClient.from_transport(self._client.get_transport())
+    def _sftp_transfer(self, transfer, source, destination, resume):
+        # every transfer gets its own sftp channel with a window large
+        # enough to keep many pipelined requests in flight
+        sftp = self._with_session(_sftp_on_channel, window_size=SFTP_WINDOW_SIZE)
         try:
-            sftp.put(local_path, remote_path)
+            transfer(sftp, source, destination, resume)
         finally:
             sftp.close()
-            self._close()
 
-    def _connect(self):
-        self._client.connect(self._address, username=self._username, password=self._password)
+    def close(self):
+        with self._lock:
+            if self._finalizer is not None:
+                self._finalizer()
+            self._client = None
+            self._finalizer = None
 
-    def _close(self):
-        self._client.close()
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _with_session(self, use_channel, **session_args):
+        """
+        :param use_channel: starts using a newly opened session channel,
+         i.e. runs a command on it
+        :param session_args: passed to paramiko's Transport.open_session
+        :returns: the result of use_channel, retried once on a new
+         connection if the current one turns out to be broken
+        """
+        try:
+            return use_channel(self._open_session(**session_args))
+        except _CONNECTION_ERRORS as e:
+            LOGGER.debug(f'sshlib: session to {self._address} broken, reconnecting: {e}')
+            self.close()
+            return use_channel(self._open_session(**session_args))
+
+    def _open_session(self, **session_args):
+        transport = self._connected_client().get_transport()
+        return transport.open_session(timeout=SESSION_OPEN_TIMEOUT, **session_args)
+
+    def _connected_client(self):
+        with self._lock:
+            if self._client is not None:
+                transport = self._client.get_transport()
+                if transport is not None and transport.is_active():
+                    return self._client
+                self._finalizer()
+            client = paramiko.SSHClient()
+            client.set_missing_host_key_policy(paramiko.WarningPolicy())
+            client.connect(self._address, username=self._username, password=self._password, compress=self._compress)
+            self._client = client
+            self._finalizer = weakref.finalize(self, client.close)
+            return client
 
     def set_mtu(self, iface_name, mtu_value):
         self.exec_command('ip link set {iface} mtu {mtu}'.format(iface=iface_name, mtu=mtu_value))
@@ -146,27 +240,56 @@ class Node(object):
         :param int data_size: size of payload without headers
         :param str pmtudisc: fragmenting policy
         """
-        try:
-            version = ipaddress.ip_address(target).version
-        except ValueError as e:
-            if 'does not appear to be an IPv4 or IPv6 address' in str(e):
-                # assume target is a hostname
-                version = ip_version
-            else:
-                raise e
-        options = [
-            f'-{version}',
-            '-c 1',
-            f'-s {data_size}',
-        ]
-        if iface_name:
-            options.append(f'-I {iface_name}')
-        if pmtudisc:
-            options.append(f'-M {pmtudisc}')
-        cmd = f'ping {" ".join(options)} {target}'
+        cmd = _ping_command(target, ip_version, iface_name, data_size, pmtudisc)
         LOGGER.debug(cmd)
         self.exec_command(cmd)
 
+    def probe_matrix(self, targets, ip_version=4, netns=None, sizes=(56,), pmtudisc='do', iface_name=None):
+        """
+        Ping every target with every payload size, all at once, using a single
+        ssh command
+        :param targets: ips or hostnames
+        :param int ip_version: 4 or 6, used for hostnames
+        :param str netns: optional networking namespace to ping from
+        :param sizes: sizes of payload without headers
+        :param str pmtudisc: fragmenting policy
+        :param str iface_name: interface name to ping from
+        :returns: list of ProbeResult, one per target and size, in the order
+         of the targets, then the sizes. The exit code is None if the ping
+         didn't report one.
+        """
+        probes = [(target, size) for target in targets for size in sizes]
+        script = ''.join(
+            f'({_ping_command(target, ip_version, iface_name, size, pmtudisc, wait=1)} >/dev/null 2>&1; '
+            f'echo "{i} $?") &\n'
+            for i, (target, size) in enumerate(probes)
+        )
+        script += 'wait\n'
+        netns_prefix = f'ip netns exec {netns} ' if netns else ''
+        cmd = f'{netns_prefix}sh -c {shlex.quote(script)}'
+        LOGGER.debug(f'sshlib: probing {len(probes)} target/size pairs from {self._address}')
+        exit_codes = {}
+        for line in self.exec_command(cmd).decode().splitlines():
+            index, exit_code = line.split()
+            exit_codes[int(index)] = int(exit_code)
+        results = []
+        for i, (target, size) in enumerate(probes):
+            exit_code = exit_codes.get(i)
+            results.append(ProbeResult(target, size, exit_code == 0, exit_code))
+        return results
+
+    def retry_probe_matrix(self, targets, **probe_args):
+        """
+        Wait until all the targets are reachable, see probe_matrix
+        """
+        syncutil.sync(
+            exec_func=lambda: self.probe_matrix(targets, **probe_args),
+            exec_func_args=(),
+            success_criteria=lambda results: all(result.reachable for result in results),
+            delay_start=1,
+            timeout=15,
+        )
+
     def global_replace_str_in_file(self, old, new, filename):
         return self.exec_command(f'sed -i -r "s/{old}/{new}/g" "{filename}"')
 
@@ -180,3 +303,151 @@ class Node(object):
             f'username:{self._username},'
             f'password:{self._password}>'
         )
+
+
+def _put_file(sftp, local_path, remote_path, resume):
+    size = os.stat(local_path).st_size
+    offset = _resume_offset(lambda: sftp.stat(remote_path).st_size, size) if resume else 0
+    if offset == size and offset:
+        LOGGER.debug(f'sshlib: {remote_path} already copied, skipping')
+        return
+    with open(local_path, 'rb') as local_file, sftp.open(remote_path, 'r+b' if offset else 'wb') as remote_file:
+        remote_file.set_pipelined(True)
+        local_file.seek(offset)
+        remote_file.seek(offset)
+        for chunk in iter(lambda: local_file.read(SFTP_CHUNK_SIZE), b''):
+            remote_file.write(chunk)
+    remote_size = sftp.stat(remote_path).st_size
+    if remote_size != size:
+        raise SshException(f'Size mismatch copying {local_path} to {remote_path}: {remote_size} != {size}')
+
+
+def _get_file(sftp, remote_path, local_path, resume):
+    with sftp.open(remote_path, 'rb') as remote_file:
+        size = remote_file.stat().st_size
+        offset = _resume_offset(lambda: os.stat(local_path).st_size, size) if resume else 0
+        if offset == size and offset:
+            LOGGER.debug(f'sshlib: {local_path} already copied, skipping')
+            return
+        remote_file.seek(offset)
+        remote_file.prefetch(size)
+        with open(local_path, 'r+b' if offset else 'wb') as local_file:
+            local_file.seek(offset)
+            for chunk in iter(lambda: remote_file.read(SFTP_CHUNK_SIZE), b''):
+                local_file.write(chunk)
+            local_file.truncate()
+
+
+def _resume_offset(get_copied_size, size):
+    try:
+        copied_size = get_copied_size()
+    except FileNotFoundError:
+        return 0
+    # bigger than the source means it's a different file, copy it again
+    return copied_size if copied_size <= size else 0
+
+
+def _ping_command(target, ip_version, iface_name=None, data_size=56, pmtudisc=None, wait=None):
+    try:
+        version = ipaddress.ip_address(target).version
+    except ValueError as e:
+        if 'does not appear to be an IPv4 or IPv6 address' in str(e):
+            # assume target is a hostname
+            version = ip_version
+        else:
+            raise e
+    options = [
+        f'-{version}',
+        '-c 1',
+        f'-s {data_size}',
+    ]
+    if iface_name:
+        options.append(f'-I {iface_name}')
+    if pmtudisc:
+        options.append(f'-M {pmtudisc}')
+    if wait:
+        options.append(f'-W {wait}')
+    return f'ping {" ".join(options)} {target}'
+
+
+# exit_code is ping's: 1 when there was no reply, 2 on other errors
+ProbeResult = collections.namedtuple('ProbeResult', 'target data_size reachable exit_code')
+
+
+class NodeResult(collections.namedtuple('NodeResult', 'node output error')):
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _exec_on_channel(channel, command):
+    # what SSHClient.exec_command does, but on a channel opened with a timeout
+    channel.exec_command(command)
+    return channel.makefile('r'), channel.makefile_stderr('r')
+
+
+def _sftp_on_channel(channel):
+    channel.invoke_subsystem('sftp')
+    return paramiko.SFTPClient(channel)
+
+
+class NodeGroup(object):
+    """
+    Runs operations on many nodes concurrently, each node on its own
+    thread and over its own persistent session.
+
+    group = NodeGroup([node0, node1])
+    group.exec_command('hostname')
+    group.map(lambda node, target: node.ping(target, 4), ['10.0.0.1', '10.0.0.2'])
+    """
+
+    def __init__(self, nodes):
+        self._nodes = list(nodes)
+
+    def exec_command(self, command, raise_on_failure=True):
+        return self.map(lambda node: node.exec_command(command), raise_on_failure=raise_on_failure)
+
+    def map(self, func, *iterables, raise_on_failure=True):
+        """
+        :param func: called as func(node, *args) on every node, with args
+         taken from 'iterables' in the order of the nodes, like map does
+        :param raise_on_failure: raise the error of the first node that
+         failed, after all the nodes are done
+        :returns: list of NodeResult, in the order of the nodes
+        """
+        args = list(zip(*iterables)) if iterables else [()] * len(self._nodes)
+        if len(args) != len(self._nodes):
+            raise ValueError(f'Got {len(args)} arguments for {len(self._nodes)} nodes')
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(len(self._nodes), 1)) as executor:
+            futures = [executor.submit(func, node, *node_args) for node, node_args in zip(self._nodes, args)]
+        results = []
+        for node, future in zip(self._nodes, futures):
+            error = future.exception()
+            results.append(NodeResult(node, None if error else future.result(), error))
+        if raise_on_failure:
+            for result in results:
+                if not result.ok:
+                    raise result.error
+        return results
+
+    def close(self):
+        for node in self._nodes:
+            node.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    def __getitem__(self, index):
+        return self._nodes[index]
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}| nodes:{self._nodes}>'
@@ -97,7 +97,7 @@ class StorageDomainStatus(object):
 class StorageDomain(SDKRootEntity):
     @property
     def name(self):
-        return self.get_sdk_type().name
+        return self.last_sdk_type().name
 
     @property
     def status(self):
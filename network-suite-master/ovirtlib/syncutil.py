@@ -6,6 +6,9 @@
 import collections
 import logging
 import os
+import random
+import sys
+import threading
 import time
 
 from . import eventlib
@@ -14,6 +17,90 @@ DEFAULT_DELAY_START = 0
 DEFAULT_INTERVAL = 3
 DEFAULT_TIMEOUT = 120
 DELIM = '~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~'
+AUDIT_BATCH_SIZE = 10
+
+
+class _Settings:
+    buffered_audit = False
+
+
+def set_buffered_audit(buffered):
+    """
+    Buffer the engine events posted for syncs with an sdk_entity instead
+    of posting one before every attempt, see _Auditor
+    """
+    _Settings.buffered_audit = buffered
+
+
+class FixedBackoff(object):
+    def __init__(self, interval):
+        self.interval = interval
+
+    def delays(self):
+        while True:
+            yield self.interval
+
+
+class ExponentialBackoff(object):
+    """
+    Retries quickly at first and then slows down: every delay is 'factor'
+    times the previous one, at most 'max_interval', randomized by 'jitter'
+    """
+
+    def __init__(self, initial=1, factor=2, max_interval=30, jitter=0.1):
+        self.initial = initial
+        self.factor = factor
+        self.max_interval = max_interval
+        self.jitter = jitter
+
+    def delays(self):
+        delay = self.initial
+        while True:
+            yield delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            delay = min(delay * self.factor, self.max_interval)
+
+
+class SyncMetrics(object):
+    """Attempts and time spent by sync, per call site"""
+
+    _Stats = collections.namedtuple('_Stats', 'calls attempts total_time success_times outcomes')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, call_site, attempts, duration, outcome):
+        with self._lock:
+            stats = self._stats.get(call_site) or self._Stats(0, 0, 0.0, [], collections.Counter())
+            if outcome == 'success':
+                stats.success_times.append(duration)
+            stats.outcomes[outcome] += 1
+            self._stats[call_site] = stats._replace(
+                calls=stats.calls + 1,
+                attempts=stats.attempts + attempts,
+                total_time=stats.total_time + duration,
+            )
+
+    def report(self):
+        """One line per call site, the most time consuming first"""
+        with self._lock:
+            stats = sorted(self._stats.items(), key=lambda item: item[1].total_time, reverse=True)
+        lines = []
+        for call_site, site_stats in stats:
+            success_times = site_stats.success_times
+            mean_success = f'{sum(success_times) / len(success_times):.1f}s' if success_times else '-'
+            lines.append(
+                f'{site_stats.total_time:8.1f}s {site_stats.calls:4d} calls {site_stats.attempts:5d} attempts '
+                f'mean time to success {mean_success:>7} {dict(site_stats.outcomes)} {call_site}'
+            )
+        return '\n'.join(lines)
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+
+METRICS = SyncMetrics()
 
 
 class Timeout(Exception):
@@ -34,6 +121,7 @@ def sync(
     retry_interval=DEFAULT_INTERVAL,
     timeout=DEFAULT_TIMEOUT,
     sdk_entity=None,
+    backoff=None,
 ):
     """Sync an operation until it either:
 
@@ -58,6 +146,8 @@ def sync(
     all results and all errors to return and raise respectively. The default
     timeout is 120 seconds.
 
+    Every call is recorded in METRICS under the place it was called from.
+
     :param exec_func: callable
     :param exec_func_args: tuple/dict
     :param success_criteria: callable
@@ -67,42 +157,30 @@ def sync(
     :param timeout: int
     :param sdk_entity: ovirtlib instance for which auditing to engine.log
                        before each retry is desired
+    :param backoff: FixedBackoff/ExponentialBackoff for the time between
+                    retries, replaces retry_interval if given
     :return: the result of running the exec_func
     """
-    end_time = _monothonic_time() + timeout
+    start_time = _monothonic_time()
+    end_time = start_time + timeout
+    call_site = _call_site(exec_func)
+    delays = (backoff or FixedBackoff(retry_interval)).delays()
+    audit = _Auditor(sdk_entity, exec_func)
+    attempts = 0
+    outcome = 'error'
 
     args, kwargs = _parse_args(exec_func_args)
     logger = SyncLogger(exec_func, args, kwargs)
     logger.log_start()
     try:
-        time.sleep(delay_start)
-        _audit(exec_func, sdk_entity, 0)
-        result = exec_func(*args, **kwargs)
-        logger.log_iteration(0, result)
-    except Exception as e:
-        logger.log_iteration(0, e)
-        if error_criteria(e):
-            logger.log_end(e)
-            raise
-        result = e
-    else:
-        if success_criteria(result):
-            logger.log_end(result)
-            return result
-
-    i = 0
-    while _monothonic_time() < end_time:
-        i += 1
-        time.sleep(retry_interval)
         try:
-            _audit(exec_func, sdk_entity, i)
+            time.sleep(delay_start)
+            audit(0)
+            attempts += 1
             result = exec_func(*args, **kwargs)
-            logger.log_iteration(i, result)
+            logger.log_iteration(0, result)
         except Exception as e:
-            logger.log_iteration(i, e)
-            if success_criteria(e):
-                logger.log_end(e)
-                return e
+            logger.log_iteration(0, e)
             if error_criteria(e):
                 logger.log_end(e)
                 raise
@@ -110,19 +188,86 @@ def sync(
         else:
             if success_criteria(result):
                 logger.log_end(result)
+                outcome = 'success'
                 return result
 
-    logger.log_end(result)
-    raise Timeout(result)
+        i = 0
+        while _monothonic_time() < end_time:
+            i += 1
+            time.sleep(next(delays))
+            try:
+                audit(i)
+                attempts += 1
+                result = exec_func(*args, **kwargs)
+                logger.log_iteration(i, result)
+            except Exception as e:
+                logger.log_iteration(i, e)
+                if success_criteria(e):
+                    logger.log_end(e)
+                    outcome = 'success'
+                    return e
+                if error_criteria(e):
+                    logger.log_end(e)
+                    raise
+                result = e
+            else:
+                if success_criteria(result):
+                    logger.log_end(result)
+                    outcome = 'success'
+                    return result
+
+        logger.log_end(result)
+        outcome = 'timeout'
+        raise Timeout(result)
+    finally:
+        audit.flush()
+        METRICS.record(call_site, attempts, _monothonic_time() - start_time, outcome)
+
 
+def _call_site(exec_func):
+    # the frame of whoever called sync
+    frame = sys._getframe(2)
+    name = getattr(exec_func, '__qualname__', repr(exec_func))
+    return f'{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} {name}'
 
-def _audit(exec_func, sdk_entity, i):
-    if sdk_entity:
+
+class _Auditor:
+    """
+    Posts an engine event before every attempt of a sync with an sdk_entity
+
+    With buffered auditing (see set_buffered_audit), the messages are kept
+    and posted joined together in one event per AUDIT_BATCH_SIZE attempts,
+    plus one for whatever is left when the sync ends.
+    """
+
+    def __init__(self, sdk_entity, exec_func):
+        self._sdk_entity = sdk_entity
+        self._exec_func = exec_func
+        self._buffer = []
+
+    def __call__(self, i):
+        if not self._sdk_entity:
+            return
         try:
-            repr = sdk_entity.__repr__()
+            repr = self._sdk_entity.__repr__()
         except Exception:
-            repr = f'{sdk_entity.__class__.__name__}.__repr__() call failed'
-        eventlib.EngineEvents(sdk_entity.system).add(f'{DELIM} OST - retry[{i}] {exec_func.__name__}: {repr}')
+            repr = f'{self._sdk_entity.__class__.__name__}.__repr__() call failed'
+        message = f'{DELIM} OST - retry[{i}] {self._exec_func.__name__}: {repr}'
+        if not _Settings.buffered_audit:
+            eventlib.EngineEvents(self._sdk_entity.system).add(message)
+            return
+        self._buffer.append(message)
+        if len(self._buffer) >= AUDIT_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        messages, self._buffer = self._buffer, []
+        try:
+            eventlib.EngineEvents(self._sdk_entity.system).add('\n'.join(messages))
+        except Exception as e:
+            logging.getLogger(__name__).warning(f'sync: failed to post {len(messages)} audit messages: {e}')
 
 
 def re_run(exec_func, exec_func_args, count, interval):
@@ -149,7 +294,7 @@ def _parse_args(exec_func_args):
 
 
 def _monothonic_time():
-    return os.times()[4]
+    return time.monotonic()
 
 
 class SyncLogger:
@@ -5,6 +5,7 @@
 #
 from ovirtsdk4 import types
 
+from . import lookuplib
 from . import syncutil
 from .sdkentity import EntityNotFoundError
 
@@ -35,10 +36,7 @@ def wait_for_template_ok_status(system, template_name):
 
 
 def _get_template(templates_service, template_name):
-    try:
-        return next(template for template in templates_service.list() if template.name == template_name)
-    except StopIteration:
-        return None
+    return next(iter(lookuplib.search_by_name(templates_service, template_name)), None)
 
 
 def _check_template(template):
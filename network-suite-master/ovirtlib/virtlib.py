@@ -48,7 +48,7 @@ class SnapshotNotInPreviewError(Exception):
 class Vm(SDKRootEntity):
     @property
     def name(self):
-        return self.get_sdk_type().name
+        return self.last_sdk_type().name
 
     @property
     def host(self):
@@ -116,10 +116,7 @@ class Vm(SDKRootEntity):
         return vnic
 
     def vnics(self):
-        for nic_service in self._service.nics_service().list():
-            vnic = netlib.Vnic(self)
-            vnic.import_by_id(nic_service.id)
-            yield vnic
+        yield from netlib.Vnic.from_sdk_types(self, self._service.nics_service().list())
 
     def attach_disk(
         self,
@@ -234,10 +231,7 @@ class Vm(SDKRootEntity):
 
     @staticmethod
     def iterate(system):
-        for sdk_obj in system.vms_service.list():
-            vm = Vm(system)
-            vm.import_by_id(sdk_obj.id)
-            yield vm
+        yield from Vm.from_sdk_types(system, system.vms_service.list())
 
     def __repr__(self):
         return self._execute_without_raising(
@@ -44,20 +44,26 @@ from fixtures.data_center import data_centers_service
 from fixtures.data_center import default_data_center
 
 from fixtures.system import system
+from fixtures.system import sync_metrics
 
 # Import OST utils fixtures
 from ost_utils.pytest.fixtures.ansible import ansible_all
+from ost_utils.pytest.fixtures.ansible import ansible_async
 from ost_utils.pytest.fixtures.ansible import ansible_by_hostname
 from ost_utils.pytest.fixtures.ansible import ansible_engine
 from ost_utils.pytest.fixtures.ansible import ansible_engine_facts
+from ost_utils.pytest.fixtures.ansible import ansible_facts_service
 from ost_utils.pytest.fixtures.ansible import ansible_host0
 from ost_utils.pytest.fixtures.ansible import ansible_host0_facts
 from ost_utils.pytest.fixtures.ansible import ansible_host1
 from ost_utils.pytest.fixtures.ansible import ansible_host1_facts
 from ost_utils.pytest.fixtures.ansible import ansible_hosts
 from ost_utils.pytest.fixtures.ansible import ansible_storage_facts
+from ost_utils.pytest.fixtures.ansible import ansible_strategy
 from ost_utils.pytest.fixtures.ansible import ansible_inventory
+from ost_utils.pytest.fixtures.ansible import ansible_ssh_multiplexing
 from ost_utils.pytest.fixtures.ansible import ansible_storage
+from ost_utils.pytest.fixtures.ansible import ansible_worker_pool
 from ost_utils.pytest.fixtures.artifacts import artifacts_dir
 from ost_utils.pytest.fixtures.artifacts import collect_artifacts
 from ost_utils.pytest.fixtures.artifacts import dump_dhcp_leases
@@ -62,7 +62,7 @@ def test_validate_ovn_provider_connectivity(
         (ssh1, net11),
         (ssh1, net14),
     )
-    with _create_namespaces(connections):
+    with ssh0, ssh1, _create_namespaces(connections):
         with _create_ovs_ports(connections, af):
             ssh0.retry_ping_from_netns(net11.ip, net10.port.name)
             ssh1.retry_ping_from_netns(net10.ip, net11.port.name)
@@ -72,9 +72,8 @@ def test_validate_ovn_provider_connectivity(
 
             _update_routes(default_ovn_provider_client, net10.subnet, net11.subnet)
 
-            ssh1.retry_ping_from_netns(net10.ip, net14.port.name)
+            ssh1.retry_probe_matrix((net10.ip, net11.ip), netns=net14.port.name)
             ssh0.retry_ping_from_netns(net14.ip, net10.port.name)
-            ssh1.retry_ping_from_netns(net11.ip, net14.port.name)
             ssh1.retry_ping_from_netns(net14.ip, net11.port.name)
 
 
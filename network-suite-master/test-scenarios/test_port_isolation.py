@@ -31,8 +31,10 @@ LOGGER = logging.getLogger(__name__)
 def test_ping_to_external_port_succeeds(vm_nodes, vms_conf, isolated_ifaces_up_with_ip, af, request):
     if af.is6:
         request.node.add_marker(pytest.mark.xfail(reason='CI lab does not provide external ipv6 connectivity'))
-    for i, vm_node in enumerate(vm_nodes):
-        vm_node.ping(EXTERNAL_IP[af.family], af.version, vms_conf[i].isolated_iface.name)
+    vm_nodes.map(
+        lambda vm_node, vm_conf: vm_node.ping(EXTERNAL_IP[af.family], af.version, vm_conf.isolated_iface.name),
+        vms_conf,
+    )
 
 
 def test_ping_to_mgmt_port_succeeds(vm_nodes, vms_conf, mgmt_ifaces_up_with_ip, af):
@@ -65,10 +67,13 @@ def vms_conf(management_subnet, storage_subnet):
 
 @pytest.fixture(scope='module')
 def vm_nodes(mgmt_ifaces_up_with_ip):
-    return (
-        sshlib.Node(mgmt_ifaces_up_with_ip[0], VM_PASSWORD, VM_USERNAME),
-        sshlib.Node(mgmt_ifaces_up_with_ip[1], VM_PASSWORD, VM_USERNAME),
-    )
+    with sshlib.NodeGroup(
+        (
+            sshlib.Node(mgmt_ifaces_up_with_ip[0], VM_PASSWORD, VM_USERNAME),
+            sshlib.Node(mgmt_ifaces_up_with_ip[1], VM_PASSWORD, VM_USERNAME),
+        )
+    ) as nodes:
+        yield nodes
 
 
 @pytest.fixture(scope='module')
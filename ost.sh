@@ -8,6 +8,13 @@ run [-4|-6] [--ost-coverage] <suite> <distro> [<pytest args>...]
     initializes the workspace with preinstalled distro ost-images, launches VMs and runs the whole suite
     add extra repos with --custom-repo=url
     skip check that extra repo is actually used with --skip-custom-repos-check
+    run ansible module calls in a pool of N warm worker processes with --ansible-workers=N
+    let each host run ansible tasks at its own pace with --ansible-strategy=free
+    poll with a fixed 3s interval in assertion waits with --assert-polling=fixed
+    batch the engine events auditing network suite retries with --buffered-sync-audit
+    run parallel engine API calls over up to N connections with --engine-api-connections=N
+    wait for engine events through a session-wide event bus with --engine-event-bus
+    log every engine API call with --sdk-debug=full instead of showing the last ones on failures
 status
     show environment status, VM details
 shell <host> [command ...]
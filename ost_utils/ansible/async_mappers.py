@@ -0,0 +1,114 @@
+#
+# Copyright oVirt Authors
+# SPDX-License-Identifier: GPL-2.0-or-later
+#
+#
+
+"""asyncio front-end for ModuleMapper.
+
+ansible_runner is blocking, so the runs still happen in threads, but only
+in a fixed number of them shared by all the awaitables, instead of a thread
+per call:
+
+    async_runner = AsyncRunner(max_concurrency=8)
+    host0 = async_runner.mapper(ansible_host0)
+    host1 = async_runner.mapper(ansible_host1).with_timeout(60)
+
+    async def check():
+        return await asyncio.gather(
+            host0.shell('rpm -qa'),
+            host1.shell('journalctl -b'),
+        )
+
+    asyncio.run(check())
+
+Cancelling the awaitable, or running out of time, stops the ansible_runner
+run behind it.
+
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import threading
+
+from ost_utils.ansible import module_mappers as mm
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncRunner:
+    """Runs ModuleMapper calls for asyncio code with bounded concurrency"""
+
+    def __init__(self, max_concurrency=8):
+        self.max_concurrency = max_concurrency
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix='ansible-async',
+        )
+
+    def mapper(self, module_mapper, timeout=None):
+        return AsyncModuleMapper(self, module_mapper, timeout)
+
+    async def run(self, config_builder, timeout=None):
+        loop = asyncio.get_running_loop()
+        cancel_event = threading.Event()
+        future = loop.run_in_executor(
+            self._executor,
+            functools.partial(mm._run_ansible_runner, config_builder, cancel_event),
+        )
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            LOGGER.debug(f'AsyncRunner: stopping {config_builder}')
+            cancel_event.set()
+            raise
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __str__(self):
+        return f'AsyncRunner<max_concurrency={self.max_concurrency}>'
+
+
+class AsyncModuleArgsMapper:
+    """Like ModuleArgsMapper, but calling it returns an awaitable"""
+
+    def __init__(self, async_runner, module_args_mapper, timeout):
+        self._async_runner = async_runner
+        self._module_args_mapper = module_args_mapper
+        self._timeout = timeout
+
+    def __call__(self, *args, **kwargs):
+        config_builder = self._module_args_mapper.prepare(*args, **kwargs)
+        return self._async_runner.run(config_builder, self._timeout)
+
+    def __str__(self):
+        return f'AsyncModuleArgsMapper<{self._module_args_mapper}, timeout={self._timeout}>'
+
+
+class AsyncModuleMapper:
+    """Like ModuleMapper, but module calls return awaitables
+
+    'timeout' (in seconds) applies to every module call made through
+    this mapper, use 'with_timeout' to get a mapper with a different one.
+    """
+
+    def __init__(self, async_runner, module_mapper, timeout=None):
+        self._async_runner = async_runner
+        self._module_mapper = module_mapper
+        self._timeout = timeout
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        res = AsyncModuleArgsMapper(self._async_runner, getattr(self._module_mapper, name), self._timeout)
+        LOGGER.debug(f'AsyncModuleMapper __getattr__: {res}')
+        return res
+
+    def with_timeout(self, timeout):
+        return AsyncModuleMapper(self._async_runner, self._module_mapper, timeout)
+
+    def __str__(self):
+        return f'AsyncModuleMapper<{self._module_mapper}, timeout={self._timeout}>'
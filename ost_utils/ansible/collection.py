@@ -14,7 +14,13 @@ import uuid
 import yaml
 
 
-def _run_playbook(ansible_engine, playbook_yaml, ansible_inventory=None, ssh_key_path=None):
+def _run_playbook(ansible_engine, playbook_yaml, ansible_inventory=None, ssh_key_path=None, json_events=False):
+    """Runs the playbook with ansible-runner on the engine VM
+
+    With 'json_events', ansible-runner prints the job events as json lines
+    instead of the regular ansible output and the result of the 'shell'
+    call is returned as well, so that the events can be read directly.
+    """
     run_uuid = uuid.uuid4()
     tmp_path = tempfile.NamedTemporaryFile().name
     for dir_name in ['inventory', 'env', 'project']:
@@ -35,9 +41,12 @@ def _run_playbook(ansible_engine, playbook_yaml, ansible_inventory=None, ssh_key
         dest=os.path.join(tmp_path, 'project/playbook.yml'),
     )
 
-    ansible_engine.shell(f'ansible-runner run -i {run_uuid} -vvv -p playbook.yml {tmp_path}')
+    if json_events:
+        res = ansible_engine.shell(f'ansible-runner run -i {run_uuid} --json -p playbook.yml {tmp_path}')
+    else:
+        res = ansible_engine.shell(f'ansible-runner run -i {run_uuid} -vvv -p playbook.yml {tmp_path}')
 
-    return (tmp_path, run_uuid)
+    return (tmp_path, run_uuid, res)
 
 
 def _get_role_playbook(role_name, host, **kwargs):
@@ -114,9 +123,18 @@ def image_template(
 
 
 class CollectionMapper:
-    def __init__(self, ansible_engine, ansible_host='localhost'):
+    """Runs ovirt.ovirt collection modules on the engine VM
+
+    The module result is read from the json events ansible-runner prints
+    on the engine. With 'debug', the playbook runs with -vvv instead and
+    the whole artifacts directory is fetched from the engine to find
+    the result, which is a lot slower.
+    """
+
+    def __init__(self, ansible_engine, ansible_host='localhost', debug=False):
         self._ansible_engine = ansible_engine
         self.ansible_host = ansible_host
+        self.debug = debug
 
     def __getattr__(self, name):
         self.name = name
@@ -131,9 +149,28 @@ class CollectionMapper:
         playbook_yaml = yaml.safe_load(playbook)
         playbook_yaml[0]['tasks'][0][f'ovirt.ovirt.{self.name}'] = kwargs
 
-        remote_tmp_path, run_uuid = _run_playbook(self._ansible_engine, playbook_yaml)
+        if self.debug:
+            remote_tmp_path, run_uuid, _ = _run_playbook(self._ansible_engine, playbook_yaml)
+            return self._collect_module_data(remote_tmp_path, run_uuid)
+
+        _, _, res = _run_playbook(self._ansible_engine, playbook_yaml, json_events=True)
+        return self._find_module_result(res['stdout'].splitlines())
+
+    def _is_module_result(self, event):
+        return (
+            event.get('event_data', {}).get('task_action', None) == f'ovirt.ovirt.{self.name}'
+            and event.get('event_data').get('res', None) is not None
+        )
 
-        return self._collect_module_data(remote_tmp_path, run_uuid)
+    def _find_module_result(self, event_lines):
+        for line in event_lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(event, dict) and self._is_module_result(event):
+                return event['event_data']['res']
+        return None
 
     def _collect_module_data(self, remote_tmp_path, run_uuid):
         local_tmp_dir = tempfile.mkdtemp()
@@ -178,10 +215,7 @@ class CollectionMapper:
             for file in job_events:
                 with open(file) as json_file:
                     data = json.load(json_file)
-                    if (
-                        data.get('event_data', {}).get('task_action', None) == f'ovirt.ovirt.{self.name}'
-                        and data.get('event_data').get('res', None) is not None
-                    ):
+                    if self._is_module_result(data):
                         return data.get('event_data').get('res')
             return None
         finally:
@@ -4,6 +4,7 @@
 #
 #
 
+import collections
 import logging
 
 import ansible_runner
@@ -13,6 +14,10 @@ from ost_utils.ansible import private_dir as pd
 
 LOGGER = logging.getLogger(__name__)
 
+# how ansible runs the tasks, ansible's defaults when None, except for
+# private_data_dir which defaults to the calling thread's private directory
+RunOptions = collections.namedtuple('RunOptions', 'forks strategy private_data_dir', defaults=(None, None, None))
+
 
 class ConfigBuilder:
     """This class prepares an ansible_runner.RunnerConfig instance.
@@ -27,15 +32,24 @@ class ConfigBuilder:
         self.host_pattern = None
         self.module = None
         self.module_args = None
+        self.playbook = None
+        self.run_options = RunOptions()
 
     def prepare(self):
+        envvars = {}
+        if self.run_options.strategy is not None:
+            # applies to ad-hoc module calls as well as to playbooks
+            envvars['ANSIBLE_STRATEGY'] = self.run_options.strategy
         config = ansible_runner.RunnerConfig(
             inventory=self.inventory,
             extravars=self.extravars,
             host_pattern=self.host_pattern,
             module=self.module,
             module_args=self.module_args,
-            private_data_dir=pd.PrivateDir.get(),
+            playbook=self.playbook,
+            forks=self.run_options.forks,
+            envvars=envvars,
+            private_data_dir=self.run_options.private_data_dir or pd.PrivateDir.get(),
             quiet=True,
         )
         config.prepare()
@@ -46,5 +60,6 @@ class ConfigBuilder:
         return (
             f'ConfigBuilder<inventory={self.inventory}, '
             f'host_pattern={self.host_pattern}, module={self.module}, '
-            f'module_args={self.module_args}>'
+            f'module_args={self.module_args}, forks={self.run_options.forks}, '
+            f'strategy={self.run_options.strategy}>'
         )
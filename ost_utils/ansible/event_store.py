@@ -0,0 +1,165 @@
+#
+# Copyright oVirt Authors
+# SPDX-License-Identifier: GPL-2.0-or-later
+#
+#
+
+import contextlib
+import gzip
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import zlib
+
+from ost_utils.ansible import private_dir as pd
+
+EVENTS_DB = 'events.sqlite'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS events (
+    created TEXT NOT NULL,
+    host TEXT,
+    module TEXT,
+    event TEXT,
+    stdout TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_created ON events (created);
+CREATE INDEX IF NOT EXISTS events_host ON events (host, created);
+CREATE INDEX IF NOT EXISTS events_module ON events (module, created);
+'''
+
+
+class EventWriter:
+    """Appends ansible_runner events to the event store of a private directory
+
+    Every private directory gets its own sqlite database. A private
+    directory is only used by one run at a time, so there's always a single
+    writer per database and a run's events are committed in one
+    transaction when the writer is closed. The full event is kept
+    zlib-compressed, the columns used for lookups are kept next to it.
+    """
+
+    def __init__(self, private_data_dir):
+        self.path = os.path.join(private_data_dir, EVENTS_DB)
+        self._conn = None
+
+    def __enter__(self):
+        # ansible_runner may call the event handler from another thread
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        return self
+
+    def __exit__(self, *_):
+        self._conn.commit()
+        self._conn.close()
+        self._conn = None
+
+    def write(self, event):
+        event_data = event.get('event_data', {})
+        self._conn.execute(
+            'INSERT INTO events (created, host, module, event, stdout, data) VALUES (?, ?, ?, ?, ?, ?)',
+            (
+                event.get('created') or '',
+                event_data.get('host'),
+                event_data.get('task_action'),
+                event.get('event'),
+                event.get('stdout', ''),
+                zlib.compress(json.dumps(event).encode()),
+            ),
+        )
+
+
+def _decode(data):
+    return json.loads(zlib.decompress(data))
+
+
+class EventStore:
+    """Queries the events of all ansible_runner runs
+
+    The events are spread over the databases of all the private
+    directories, each query is run against all of them and the rows
+    are merged by their creation time.
+    """
+
+    def __init__(self, private_dirs):
+        self.paths = [
+            os.path.join(private_dir, EVENTS_DB)
+            for private_dir in private_dirs
+            if os.path.exists(os.path.join(private_dir, EVENTS_DB))
+        ]
+
+    @classmethod
+    def of_session(cls):
+        return cls(pd.PrivateDir.all_dirs)
+
+    @classmethod
+    def import_event_files(cls, event_data_files):
+        """Adds events that ansible_runner saved as json files
+
+        Runs that don't go through ModuleMapper (i.e. ovirtlib's playbooks)
+        still leave their events in 'artifacts/<ident>/job_events' of
+        their private directory.
+        """
+
+        def private_dir_of(path):
+            return os.path.abspath(os.path.join(os.path.dirname(path), '..', '..', '..'))
+
+        for private_dir, paths in itertools.groupby(sorted(event_data_files), key=private_dir_of):
+            with EventWriter(private_dir) as writer:
+                for path in paths:
+                    with open(path) as event_file:
+                        writer.write(json.load(event_file))
+
+    def query(self, host=None, module=None, since=None, until=None):
+        """Yields events ordered by their creation time
+
+        'module' is the name the module was called with, i.e. 'shell',
+        'since' and 'until' are ISO formatted times, like ansible_runner's
+        'created' field.
+        """
+        conditions = []
+        params = []
+        for column, operator, value in (
+            ('host', '=', host),
+            ('module', '=', module),
+            ('created', '>=', since),
+            ('created', '<', until),
+        ):
+            if value is not None:
+                conditions.append(f'{column} {operator} ?')
+                params.append(value)
+        where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+        for _, data in self._merged(f'SELECT created, data FROM events {where} ORDER BY created', params):
+            yield _decode(data)
+
+    def export_host_logs(self, target_dir):
+        """Writes the stdout of all events to one log file per host"""
+        rows = self._merged(
+            "SELECT host, created, stdout FROM events "
+            "WHERE host IS NOT NULL AND created != '' AND stdout != '' "
+            "ORDER BY host, created"
+        )
+        for host, host_rows in itertools.groupby(rows, key=lambda row: row[0]):
+            with open(os.path.join(target_dir, host), 'w') as log_file:
+                for _, _, stdout in host_rows:
+                    log_file.write(stdout)
+                    log_file.write('\n')
+
+    def export_raw(self, path):
+        """Writes all events as gzip compressed json lines"""
+        with gzip.open(path, 'wt') as raw_file:
+            for _, data in self._merged('SELECT created, data FROM events ORDER BY created'):
+                raw_file.write(zlib.decompress(data).decode())
+                raw_file.write('\n')
+
+    def _merged(self, sql, params=()):
+        with contextlib.ExitStack() as stack:
+            cursors = []
+            for path in self.paths:
+                conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+                stack.callback(conn.close)
+                cursors.append(conn.execute(sql, params))
+            yield from heapq.merge(*cursors)
@@ -4,18 +4,38 @@
 #
 #
 
+import json
+import logging
+import os
+import threading
+
+from ost_utils.ansible.module_mappers import AnsibleExecutionError
+
+LOGGER = logging.getLogger(__name__)
+
 
 class Facts:
     """
     Uses ModuleMapper and gather_facts module to obtain and cache facts
     about a VM.
+
+    When given a FactsService, the facts are taken from there instead,
+    so they're gathered for all the VMs at once and shared between
+    all the Facts instances.
     """
 
-    def __init__(self, module_mapper):
+    def __init__(self, module_mapper, facts_service=None):
         self._module_mapper = module_mapper
+        self._facts_service = facts_service
         self._cache = {}
 
-    def get_all(self):
+    def get_all(self, gather_subset=('all',)):
+        """
+        :param gather_subset: the facts needed by the caller, only used
+         with a FactsService - on its own, this class caches all the facts
+        """
+        if self._facts_service is not None:
+            return self._facts_service.get_all(self._module_mapper, gather_subset)
         if not self._cache:
             self.refresh()
         return self._cache
@@ -26,9 +46,122 @@ class Facts:
          to get a leaf value in the facts dict use -
          self.get('ansible_eth0').get('ipv4').get('address')
         """
+        if self._facts_service is not None:
+            return self._facts_service.get(self._module_mapper, key)
         if not self._cache:
             self.refresh()
         return self._cache[key]
 
     def refresh(self):
+        if self._facts_service is not None:
+            self._facts_service.invalidate(self._module_mapper.host_pattern)
+            return
         self._cache = self._module_mapper.gather_facts()['ansible_facts']
+
+
+class FactsService:
+    """Gathers facts about all the VMs in one ansible run and caches them
+
+    Facts are gathered with 'gather_subset' only, which is a lot faster than
+    gathering all of them. If someone asks for a fact that's not part
+    of the subset, all the facts are gathered.
+
+    When 'cache_path' is given, the facts are persisted there, so that
+    another session running against the same deployment doesn't have to
+    gather them again - except for the network facts, which are gathered
+    again once per session since the previous one may have changed host
+    networking. Call 'invalidate' after changing something the facts
+    describe, i.e. network configuration of a VM.
+    """
+
+    def __init__(self, ansible_all, hostnames, cache_path=None, gather_subset=('network',)):
+        self._ansible_all = ansible_all
+        self._hostnames = list(hostnames)
+        self._cache_path = cache_path
+        self._default_subset = list(gather_subset)
+        self._lock = threading.Lock()
+        self._subsets = {}
+        self._facts = {}
+        self._load()
+
+    def get_all(self, module_mapper, gather_subset=('all',)):
+        return self._host_facts(module_mapper.host_pattern, module_mapper, list(gather_subset))
+
+    def get(self, module_mapper, key):
+        hostname = module_mapper.host_pattern
+        facts = self._host_facts(hostname, module_mapper, self._default_subset)
+        if key not in facts:
+            facts = self._host_facts(hostname, module_mapper, ['all'])
+        return facts[key]
+
+    def invalidate(self, hostname=None):
+        with self._lock:
+            if hostname is None:
+                self._facts.clear()
+                self._subsets.clear()
+            else:
+                self._facts.pop(hostname, None)
+                self._subsets.pop(hostname, None)
+            self._save()
+
+    def _host_facts(self, hostname, module_mapper, subset):
+        with self._lock:
+            if not self._covers(hostname, subset):
+                if hostname in self._hostnames:
+                    self._gather_all_hosts(subset)
+                if not self._covers(hostname, subset):
+                    # not one of the VMs we know about or unreachable
+                    # when gathering for all of them, try on its own
+                    self._gather(module_mapper, subset)
+                self._save()
+            return self._facts[hostname]
+
+    def _covers(self, hostname, subset):
+        gathered = self._subsets.get(hostname, set())
+        return 'all' in gathered or gathered.issuperset(subset)
+
+    def _gather_all_hosts(self, subset):
+        try:
+            self._gather(self._ansible_all, subset)
+        except AnsibleExecutionError as e:
+            LOGGER.warning(f'FactsService: gathering facts for all hosts failed: {e}')
+
+    def _gather(self, module_mapper, subset):
+        LOGGER.debug(f'FactsService: gathering {subset} facts with {module_mapper}')
+        results = module_mapper.gather_facts(gather_subset=','.join(subset))
+        if 'ansible_facts' in results:
+            # ModuleMapper unwraps results of single-host patterns
+            hostname = self._hostnames[0] if module_mapper is self._ansible_all else module_mapper.host_pattern
+            results = {hostname: results}
+        for hostname, result in results.items():
+            if 'ansible_facts' not in result:
+                continue
+            self._facts.setdefault(hostname, {}).update(result['ansible_facts'])
+            self._subsets.setdefault(hostname, set()).update(subset)
+
+    def _load(self):
+        if self._cache_path is None or not os.path.exists(self._cache_path):
+            return
+        try:
+            with open(self._cache_path) as cache_file:
+                cache = json.load(cache_file)
+        except ValueError:
+            LOGGER.warning(f'FactsService: ignoring corrupted facts cache {self._cache_path}')
+            return
+        self._facts = cache['facts']
+        # the facts stay, so they're updated by the next gather, but the
+        # network ones aren't trusted until gathered in this session
+        self._subsets = {hostname: set(subset) - {'network', 'all'} for hostname, subset in cache['subsets'].items()}
+        LOGGER.debug(f'FactsService: loaded facts of {list(self._facts)} from {self._cache_path}')
+
+    def _save(self):
+        if self._cache_path is None:
+            return
+        cache = {
+            'facts': self._facts,
+            'subsets': {hostname: sorted(subset) for hostname, subset in self._subsets.items()},
+        }
+        tmp_path = f'{self._cache_path}.tmp'
+        with open(tmp_path, 'w') as cache_file:
+            json.dump(cache, cache_file)
+        os.replace(tmp_path, self._cache_path)
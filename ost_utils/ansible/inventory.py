@@ -6,6 +6,10 @@
 
 import os
 
+import yaml
+
+SSH_MULTIPLEXING_INVENTORY = 'ssh_multiplexing'
+
 
 class Inventory(object):
     """A class to handle an ansible inventory directory"""
@@ -25,3 +29,29 @@ class Inventory(object):
         with open(inv_file_name, 'wb') as inv_file:
             inv_file.write(contents)
         self.files[name] = inv_file_name
+
+    def discard(self, name):
+        """Removes an inventory file left behind by a previous session"""
+        inv_file_name = self.files.pop(name, f'{os.path.join(self.dir, name)}.yml')
+        if os.path.exists(inv_file_name):
+            os.remove(inv_file_name)
+
+    def add_ssh_multiplexing(self, control_path_dir, control_persist=300, pipelining=True):
+        """Makes ansible share ssh connections to the VMs
+
+        Adds inventory variables that make all ssh connections to a host
+        go through one ControlMaster connection kept alive for
+        'control_persist' seconds, with its socket in 'control_path_dir'.
+        With 'pipelining', modules are fed to the remote python through
+        the same connection instead of being copied over first.
+        """
+        all_vars = {
+            'ansible_ssh_args': f'-C -o ControlMaster=auto -o ControlPersist={control_persist}s',
+            'ansible_control_path_dir': control_path_dir,
+            'ansible_control_path': '%(directory)s/%%C',
+            'ansible_pipelining': pipelining,
+        }
+        self.add(
+            SSH_MULTIPLEXING_INVENTORY,
+            yaml.safe_dump({'all': {'vars': all_vars}}).encode(),
+        )
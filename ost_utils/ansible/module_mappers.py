@@ -9,65 +9,160 @@ import logging
 import ansible_runner
 
 from ost_utils.ansible import config_builder as cb
+from ost_utils.ansible import event_store as es
 from ost_utils.debuginfo_utils import obj_info
 
 LOGGER = logging.getLogger(__name__)
 
+_TASK_RESULT_EVENTS = (
+    'runner_on_ok',
+    'runner_on_failed',
+    'runner_on_skipped',
+    'runner_on_unreachable',
+)
+_TASK_FAILURE_EVENTS = ('runner_on_failed', 'runner_on_unreachable')
+
 
 class AnsibleExecutionError(Exception):
-    def __init__(self, rc, stdout):
+    def __init__(self, rc, stdout, task_index=None):
+        # pass the arguments on, so that the error can be pickled
+        # when it's raised in an ansible worker process
+        super().__init__(rc, stdout, task_index)
         self.rc = rc
         self.stdout = stdout
+        self.task_index = task_index
 
     def __str__(self):
+        if self.task_index is not None:
+            return f"Error running ansible: task_index={self.task_index}, rc={self.rc}, stdout={self.stdout}"
         return f"Error running ansible: rc={self.rc}, stdout={self.stdout}"
 
 
-def _run_ansible_runner(config_builder):
-    runner = ansible_runner.Runner(config=config_builder.prepare())
-    LOGGER.debug(f'_run_ansible_runner: before run: {runner}')
-    runner.run()
-    LOGGER.debug(f'_run_ansible_runner: after run: {obj_info(runner)}')
+class _Settings:
+    # Set by 'WorkerPool.start' when warm ansible worker processes
+    # are available, see 'ost_utils.ansible.worker_pool'
+    worker_pool = None
 
-    # Always collect results, so that we log them
-    results = _find_result(runner.events)
 
-    if runner.status != 'successful':
-        raise AnsibleExecutionError(rc=runner.rc, stdout=runner.stdout.read())
-
-    return results
+def use_worker_pool(worker_pool):
+    """Routes all ModuleMapper calls through 'worker_pool'.
 
+    Pass None to go back to running ansible_runner in the calling process.
+    """
+    _Settings.worker_pool = worker_pool
 
-def _find_result(ansible_events):
-    """Finds the result object for the ansible module call"""
 
-    events = sorted(
-        (e for e in ansible_events if 'created' in e),
-        key=lambda e: e['created'],
-    )
+def _run_ansible_runner(config_builder, cancel_event=None):
+    """Runs ansible_runner for 'config_builder' and returns the results
 
-    results = {}
+    Setting 'cancel_event' (a threading.Event) stops the run. Calls handed
+    over to a worker pool can't be stopped, setting the event has no effect
+    on those.
+    """
+    worker_pool = _Settings.worker_pool
+    if worker_pool is not None:
+        return worker_pool.run(config_builder)
+    return run_ansible_runner_locally(config_builder, cancel_event)
+
+
+def run_ansible_runner_locally(config_builder, cancel_event=None):
+    config = config_builder.prepare()
+    task_names = None
+    if config_builder.playbook is not None:
+        task_names = [task['name'] for task in config_builder.playbook[0]['tasks']]
+
+    with es.EventWriter(config.private_data_dir) as event_writer:
+        collector = _ResultCollector(event_writer, task_names)
+        runner = ansible_runner.Runner(
+            config=config,
+            event_handler=collector,
+            cancel_callback=cancel_event.is_set if cancel_event is not None else None,
+        )
+        LOGGER.debug(f'_run_ansible_runner: before run: {runner}')
+        runner.run()
+        LOGGER.debug(f'_run_ansible_runner: after run: {obj_info(runner)}')
+
+    if runner.status == 'canceled':
+        raise AnsibleExecutionError(rc=runner.rc, stdout=runner.stdout.read())
 
-    for event in reversed(events):
-        LOGGER.debug(f'_find_result: {obj_info(event)}')
-        event_data = event.get('event_data', None)
-        if event_data is not None:
-            res = event_data.get('res', None)
-            if res is not None:
-                results[event_data['host']] = res
-            elif len(results) > 0:
-                break
+    if task_names is not None:
+        if runner.status != 'successful':
+            raise AnsibleExecutionError(
+                rc=runner.rc,
+                stdout=runner.stdout.read(),
+                task_index=collector.failed_index,
+            )
+        return [_unwrap_single_host(task_results) for task_results in collector.results]
 
+    results = collector.results[0]
     if len(results) == 0:
-        LOGGER.error('No result from ansible-runner')
-        LOGGER.error('Event UUIDs: %s', [e.get('uuid') for e in events])
+        LOGGER.error(f'No result from ansible-runner, got {collector.events_count} events')
         raise RuntimeError('No result from ansible-runner')
-    elif len(results) == 1:
-        return results[next(iter(results))]
 
+    if runner.status != 'successful':
+        raise AnsibleExecutionError(rc=runner.rc, stdout=runner.stdout.read())
+
+    return _unwrap_single_host(results)
+
+
+class _ResultCollector:
+    """Captures module results from ansible_runner events as they stream in
+
+    Used as ansible_runner's 'event_handler'. Only the 'res' of task result
+    events is kept in memory, per task and per host. Every event is stored
+    by 'event_writer' instead of being saved as a separate json file.
+    Ad-hoc module calls have a single task and need no 'task_names'.
+    """
+
+    def __init__(self, event_writer, task_names=None):
+        self.event_writer = event_writer
+        if task_names is None:
+            self.index_by_name = None
+            self.results = [{}]
+        else:
+            self.index_by_name = {name: index for index, name in enumerate(task_names)}
+            self.results = [{} for _ in task_names]
+        self.failed_index = None
+        self.events_count = 0
+
+    def __call__(self, event):
+        self.events_count += 1
+        self.event_writer.write(event)
+        if event.get('event') in _TASK_RESULT_EVENTS:
+            self._add_result(event)
+        # the event is in the store already, so tell ansible_runner
+        # not to write it to 'job_events'
+        return False
+
+    def _add_result(self, event):
+        event_data = event.get('event_data', {})
+        if self.index_by_name is None:
+            index = 0
+        else:
+            index = self.index_by_name.get(event_data.get('task'))
+            if index is None:
+                return
+        LOGGER.debug(f'_ResultCollector: {obj_info(event)}')
+        self.results[index][event_data['host']] = event_data.get('res')
+        if event['event'] in _TASK_FAILURE_EVENTS and (self.failed_index is None or index < self.failed_index):
+            self.failed_index = index
+
+
+def _unwrap_single_host(results):
+    if len(results) == 1:
+        return results[next(iter(results))]
     return results
 
 
+def _module_args(args, kwargs):
+    return " ".join(
+        (
+            " ".join(args),
+            " ".join("{}={}".format(k, v) for k, v in kwargs.items()),
+        )
+    ).strip()
+
+
 class ModuleArgsMapper:
     """Passes ansible module arguments to ansible_runner's config.
 
@@ -85,21 +180,20 @@ class ModuleArgsMapper:
 
     """
 
-    def __init__(self, inventory, host_pattern, module):
+    def __init__(self, inventory, host_pattern, module, forks=None, strategy=None):
         self.config_builder = cb.ConfigBuilder()
         self.config_builder.inventory = inventory
         self.config_builder.host_pattern = host_pattern
         self.config_builder.module = module
+        self.config_builder.run_options = cb.RunOptions(forks, strategy)
 
     def __call__(self, *args, **kwargs):
-        self.config_builder.module_args = " ".join(
-            (
-                " ".join(args),
-                " ".join("{}={}".format(k, v) for k, v in kwargs.items()),
-            )
-        ).strip()
-        LOGGER.debug('ModuleArgsMapper: __call__: ' f'module_args={self.config_builder.module_args}')
-        return _run_ansible_runner(self.config_builder)
+        return _run_ansible_runner(self.prepare(*args, **kwargs))
+
+    def prepare(self, *args, **kwargs):
+        self.config_builder.module_args = _module_args(args, kwargs)
+        LOGGER.debug('ModuleArgsMapper: prepare: ' f'module_args={self.config_builder.module_args}')
+        return self.config_builder
 
     def __str__(self):
         return f'ModuleArgsMapper<config_builder={self.config_builder}>'
@@ -118,16 +212,138 @@ class ModuleMapper:
     the underlying logic will pass 'shell' as the name of the ansible
     module to use.
 
+    'forks' limits how many hosts matching the pattern are handled
+    in parallel (ansible's default is 5) and 'strategy' selects the ansible
+    strategy plugin, i.e. 'free' lets each host run through the tasks
+    at its own pace. Both can be overridden for a single call with:
+
+        mm.with_options(forks=10, strategy='free').shell(some, arguments)
+
     """
 
-    def __init__(self, inventory, host_pattern):
+    def __init__(self, inventory, host_pattern, forks=None, strategy=None):
         self.inventory = inventory
         self.host_pattern = host_pattern
+        self.forks = forks
+        self.strategy = strategy
 
     def __getattr__(self, name):
-        res = ModuleArgsMapper(self.inventory, self.host_pattern, module=name)
+        if name.startswith('_'):
+            raise AttributeError(name)
+        res = ModuleArgsMapper(
+            self.inventory,
+            self.host_pattern,
+            module=name,
+            forks=self.forks,
+            strategy=self.strategy,
+        )
         LOGGER.debug(f'ModuleMapper __getattr__: {res}')
         return res
 
+    def with_options(self, forks=None, strategy=None):
+        return ModuleMapper(
+            self.inventory,
+            self.host_pattern,
+            forks=self.forks if forks is None else forks,
+            strategy=self.strategy if strategy is None else strategy,
+        )
+
+    def batch(self):
+        return Batch(self.inventory, self.host_pattern, forks=self.forks, strategy=self.strategy)
+
+    def __str__(self):
+        return (
+            'ModuleMapper<'
+            f'inventory={self.inventory} '
+            f'host_pattern={self.host_pattern} '
+            f'forks={self.forks} '
+            f'strategy={self.strategy}'
+            '>'
+        )
+
+
+class BatchTaskMapper:
+    """Records a single module call of a Batch.
+
+    Works like ModuleArgsMapper, but instead of running the module
+    it adds a task to the batch and returns the index of the task.
+    """
+
+    def __init__(self, batch, module):
+        self.batch = batch
+        self.module = module
+
+    def __call__(self, *args, **kwargs):
+        return self.batch.add(self.module, _module_args(args, kwargs))
+
+    def __str__(self):
+        return f'BatchTaskMapper<batch={self.batch}, module={self.module}>'
+
+
+class Batch:
+    """Records ModuleMapper calls and runs them as one playbook.
+
+    Every module call made on a batch becomes one task of a generated
+    playbook that's executed by a single ansible_runner run when the
+    'with' block ends:
+
+        with mm.batch() as b:
+            b.file(path='/etc/foo', state='directory')
+            b.copy(src='bar.conf', dest='/etc/foo')
+
+        file_result, copy_result = b.results
+
+    The results are ordered like the calls. If a task fails,
+    AnsibleExecutionError is raised with 'task_index' pointing at it.
+
+    """
+
+    def __init__(self, inventory, host_pattern, forks=None, strategy=None):
+        self.inventory = inventory
+        self.host_pattern = host_pattern
+        self.forks = forks
+        self.strategy = strategy
+        self.tasks = []
+        self.results = None
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        res = BatchTaskMapper(self, module=name)
+        LOGGER.debug(f'Batch __getattr__: {res}')
+        return res
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.run()
+
+    def add(self, module, module_args):
+        index = len(self.tasks)
+        self.tasks.append({'name': f'ost-batch-{index}-{module}', module: module_args})
+        LOGGER.debug(f'Batch add: index={index}, module={module}, module_args={module_args}')
+        return index
+
+    def run(self):
+        if not self.tasks:
+            self.results = []
+            return self.results
+
+        config_builder = cb.ConfigBuilder()
+        config_builder.inventory = self.inventory
+        config_builder.host_pattern = self.host_pattern
+        config_builder.run_options = cb.RunOptions(self.forks, self.strategy)
+        config_builder.playbook = [
+            {
+                'hosts': self.host_pattern,
+                'gather_facts': False,
+                'tasks': self.tasks,
+            }
+        ]
+        self.results = _run_ansible_runner(config_builder)
+        return self.results
+
     def __str__(self):
-        return 'ModuleMapper<' f'inventory={self.inventory} ' f'host_pattern={self.host_pattern}' '>'
+        return f'Batch<inventory={self.inventory} host_pattern={self.host_pattern} tasks={len(self.tasks)}>'
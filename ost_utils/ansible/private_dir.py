@@ -6,11 +6,15 @@
 
 import glob
 import itertools
+import logging
 import os
 import shutil
+import subprocess
 import tempfile
 import threading
 
+LOGGER = logging.getLogger(__name__)
+
 
 class PrivateDir:
     """Creates private directories for ansible_runner
@@ -31,15 +35,42 @@ class PrivateDir:
 
     thread_local = threading.local()
     all_dirs = set()
+    ssh_control_dir = None
+    lock = threading.Lock()
 
     @classmethod
     def get(cls):
         if 'dir' not in cls.thread_local.__dict__:
-            path = tempfile.mkdtemp()
-            cls.thread_local.__dict__['dir'] = path
-            cls.all_dirs.add(path)
+            cls.thread_local.__dict__['dir'] = cls.create()
         return cls.thread_local.__dict__['dir']
 
+    @classmethod
+    def create(cls):
+        """Creates a private directory that is not bound to any thread
+
+        Used by owners that hand the directory over to someone else
+        (i.e. ansible worker processes), but still want it to be included
+        in log collection and cleanup.
+        """
+        path = tempfile.mkdtemp()
+        cls.all_dirs.add(path)
+        return path
+
+    @classmethod
+    def get_ssh_control_dir(cls):
+        """Returns the directory for ssh ControlMaster sockets
+
+        Unlike private directories, there's only one of these for the whole
+        session, so that all the threads and ansible workers share the same
+        master connections to the VMs.
+        """
+        with cls.lock:
+            if cls.ssh_control_dir is None:
+                # unix socket paths are limited to ~100 characters,
+                # so keep this one short
+                cls.ssh_control_dir = tempfile.mkdtemp(prefix='ost-cp-')
+            return cls.ssh_control_dir
+
     @classmethod
     def event_data_files(cls):
         return itertools.chain.from_iterable(
@@ -51,3 +82,30 @@ class PrivateDir:
         for dir in cls.all_dirs:
             shutil.rmtree(dir)
         cls.all_dirs.clear()
+        cls._cleanup_ssh_control_dir()
+
+    @classmethod
+    def _cleanup_ssh_control_dir(cls):
+        with cls.lock:
+            control_dir, cls.ssh_control_dir = cls.ssh_control_dir, None
+        if control_dir is None:
+            return
+        for socket_name in os.listdir(control_dir):
+            # ControlPersist keeps the masters running in the background,
+            # ask them to exit instead of leaving them behind
+            subprocess.run(
+                [
+                    'ssh',
+                    '-o',
+                    f'ControlPath={os.path.join(control_dir, socket_name)}',
+                    '-O',
+                    'exit',
+                    'ost-control-master',
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=10,
+                check=False,
+            )
+            LOGGER.debug(f'Stopped ssh control master {socket_name}')
+        shutil.rmtree(control_dir)
@@ -0,0 +1,148 @@
+#
+# Copyright oVirt Authors
+# SPDX-License-Identifier: GPL-2.0-or-later
+#
+#
+
+import logging
+import multiprocessing
+import pickle
+import queue
+import time
+
+from ost_utils.ansible import module_mappers as mm
+from ost_utils.ansible import private_dir as pd
+
+LOGGER = logging.getLogger(__name__)
+
+# Workers are forked, so they inherit already imported ansible_runner
+# and everything else the test session loaded - that's what makes them warm.
+_MP_CONTEXT = multiprocessing.get_context('fork')
+
+_STOP_TIMEOUT = 10
+
+
+class AnsibleWorkerError(Exception):
+    pass
+
+
+def _worker_main(conn, private_data_dir):
+    while True:
+        try:
+            config_builder = conn.recv()
+        except EOFError:
+            break
+        if config_builder is None:
+            break
+
+        config_builder.run_options = config_builder.run_options._replace(private_data_dir=private_data_dir)
+        try:
+            reply = (True, mm.run_ansible_runner_locally(config_builder))
+        except Exception as e:
+            reply = (False, e)
+
+        try:
+            conn.send(reply)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            conn.send((False, AnsibleWorkerError(repr(reply[1]))))
+
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, private_data_dir):
+        self.private_data_dir = private_data_dir
+        self.conn, child_conn = _MP_CONTEXT.Pipe()
+        self.process = _MP_CONTEXT.Process(
+            target=_worker_main,
+            args=(child_conn, private_data_dir),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def run(self, config_builder):
+        self.conn.send(config_builder)
+        return self.conn.recv()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(_STOP_TIMEOUT)
+        if self.process.is_alive():
+            LOGGER.warning(f'ansible worker {self.process.pid} did not stop, terminating it')
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+    def __str__(self):
+        return f'_Worker<pid={self.process.pid}, private_data_dir={self.private_data_dir}>'
+
+
+class WorkerPool:
+    """Runs ModuleMapper calls in a fixed set of long-lived worker processes
+
+    Every worker owns one ansible_runner private directory for its whole
+    lifetime, so the artifacts, facts cache and ssh control sockets kept
+    there are reused by all the calls the worker handles. Calls are handed
+    over to an idle worker through a local pipe and block until the worker
+    sends back the result, which keeps ModuleMapper's synchronous semantics
+    intact. When all workers are busy, callers wait for one to free up.
+
+    Once 'start' is called, ModuleMapper routes all calls to the pool:
+
+        pool = WorkerPool(4)
+        pool.start()
+        ModuleMapper(inventory, 'host-0').shell(cmd='whoami')
+        pool.stop()
+
+    """
+
+    def __init__(self, size):
+        if size < 1:
+            raise ValueError(f'Worker pool size must be positive, got {size}')
+        self.size = size
+        self._idle = queue.Queue()
+        self._workers = []
+
+    def start(self):
+        for _ in range(self.size):
+            worker = _Worker(pd.PrivateDir.create())
+            LOGGER.debug(f'WorkerPool: started {worker}')
+            self._workers.append(worker)
+            self._idle.put(worker)
+        mm.use_worker_pool(self)
+
+    def stop(self):
+        mm.use_worker_pool(None)
+        for worker in self._workers:
+            worker.stop()
+        self._workers.clear()
+
+    def run(self, config_builder):
+        worker = self._idle.get()
+        start = time.time()
+        try:
+            ok, result = worker.run(config_builder)
+        except (EOFError, OSError) as e:
+            LOGGER.error(f'WorkerPool: {worker} failed running {config_builder}: {e}')
+            worker = self._replace(worker)
+            raise AnsibleWorkerError(f'ansible worker died while running {config_builder}') from e
+        finally:
+            self._idle.put(worker)
+        LOGGER.debug(f'WorkerPool: {worker} ran {config_builder} in {time.time() - start:.2f}s')
+
+        if not ok:
+            raise result
+        return result
+
+    def _replace(self, worker):
+        worker.stop()
+        new_worker = _Worker(worker.private_data_dir)
+        self._workers[self._workers.index(worker)] = new_worker
+        return new_worker
+
+    def __str__(self):
+        return f'WorkerPool<size={self.size}>'
@@ -4,7 +4,10 @@
 #
 #
 
+import collections
+import itertools
 import logging
+import random
 import time
 
 from ost_utils import utils
@@ -15,45 +18,121 @@ SHORT_TIMEOUT = 3 * 60
 LONG_TIMEOUT = 10 * 60
 
 
-def true_within_short(func, allowed_exceptions=None, error_message=None):
-    return equals_within_short(func, True, allowed_exceptions, error_message)
+class FixedInterval:
+    """Polls every 'interval' seconds"""
 
+    def __init__(self, interval):
+        self.interval = interval
 
-def equals_within_short(func, expected_value, allowed_exceptions=None, error_message=None):
+    def delays(self):
+        return itertools.repeat(self.interval)
+
+    def __repr__(self):
+        return f'FixedInterval({self.interval})'
+
+
+class ExponentialBackoff:
+    """Polls often at first, then less and less often
+
+    The delay starts at 'initial' and grows by 'factor' after every poll, up
+    to 'max_interval'. Every delay is randomly changed by up to 'jitter'
+    of its length, so that waits started at the same time don't poll
+    in lockstep.
+    """
+
+    def __init__(self, initial=0.5, factor=1.5, max_interval=10, jitter=0.2):
+        self.initial = initial
+        self.factor = factor
+        self.max_interval = max_interval
+        self.jitter = jitter
+
+    def delays(self):
+        delay = self.initial
+        while True:
+            yield delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            delay = min(delay * self.factor, self.max_interval)
+
+    def __repr__(self):
+        return (
+            f'ExponentialBackoff(initial={self.initial}, factor={self.factor}, '
+            f'max_interval={self.max_interval}, jitter={self.jitter})'
+        )
+
+
+class _Settings:
+    default_policy = ExponentialBackoff()
+
+
+WaitRecord = collections.namedtuple('WaitRecord', 'name polls duration success')
+
+# the most recent waits, for finding the slow and chatty ones
+_wait_history = collections.deque(maxlen=1000)
+
+
+def set_default_policy(policy):
+    """Sets the polling policy of waits that don't specify their own"""
+    _Settings.default_policy = policy
+
+
+def default_policy():
+    return _Settings.default_policy
+
+
+def wait_history():
+    return list(_wait_history)
+
+
+def true_within_short(func, allowed_exceptions=None, error_message=None, policy=None):
+    return equals_within_short(func, True, allowed_exceptions, error_message, policy)
+
+
+def equals_within_short(func, expected_value, allowed_exceptions=None, error_message=None, policy=None):
     return EqualsWithin(
         func,
         expected_value,
         SHORT_TIMEOUT,
         allowed_exceptions,
         error_message,
+        policy=policy,
     )
 
 
-def true_within_long(func, allowed_exceptions=None, error_message=None):
-    return equals_within_long(func, True, allowed_exceptions, error_message)
+def true_within_long(func, allowed_exceptions=None, error_message=None, policy=None):
+    return equals_within_long(func, True, allowed_exceptions, error_message, policy)
 
 
-def equals_within_long(func, expected_value, allowed_exceptions=None, error_message=None):
+def equals_within_long(func, expected_value, allowed_exceptions=None, error_message=None, policy=None):
     return EqualsWithin(
         func,
         expected_value,
         LONG_TIMEOUT,
         allowed_exceptions,
         error_message,
+        policy=policy,
     )
 
 
-def true_within(func, timeout, allowed_exceptions=None, error_message=None):
+def true_within(func, timeout, allowed_exceptions=None, error_message=None, policy=None):
     return EqualsWithin(
         func,
         True,
         timeout,
         allowed_exceptions,
         error_message,
+        policy=policy,
     )
 
 
 class EqualsWithin:
+    """
+    Calls 'func' until it returns 'expected_value' or 'timeout' seconds pass
+
+    The time between the calls is given by 'policy', the default policy is
+    used if it's None. 'sleep_interval' is kept for compatibility, it's
+    a shortcut for FixedInterval(sleep_interval). The number of calls and
+    the time it took are available as 'polls' and 'duration'.
+    """
+
     def __init__(
         self,
         func,
@@ -61,29 +140,40 @@ class EqualsWithin:
         timeout,
         allowed_exceptions=None,
         error_message=None,
-        sleep_interval=3,
+        sleep_interval=None,
+        policy=None,
     ):
         self.expected_value = expected_value
         self.error_message = error_message
         self.success_message = f'{func.__name__}() -> {self.expected_value} == ' f'{self.expected_value}'
 
+        if policy is None:
+            policy = FixedInterval(sleep_interval) if sleep_interval is not None else _Settings.default_policy
         self.returned_value = '<no-result-obtained>'
+        self.polls = 0
         allowed_exceptions = allowed_exceptions or []
+        delays = policy.delays()
         with utils.EggTimer(timeout) as timer:
-            while not timer.elapsed():
+            while True:
+                self.polls += 1
                 try:
                     self.returned_value = func()
                     if self.returned_value == self.expected_value:
                         break
                 except Exception as exc:
-                    if any(isinstance(exc, cls) for cls in allowed_exceptions):
-                        time.sleep(sleep_interval)
-                        continue
-
-                    LOGGER.exception('Unexpected exception in %s', func.__name__)
-                    raise
-
-                time.sleep(sleep_interval)
+                    if not any(isinstance(exc, cls) for cls in allowed_exceptions):
+                        LOGGER.exception('Unexpected exception in %s', func.__name__)
+                        raise
+
+                remaining = timeout - timer.running_time
+                if remaining <= 0:
+                    break
+                # don't sleep past the deadline, poll one last time at it
+                time.sleep(min(next(delays), remaining))
+            self.duration = timer.running_time
+
+        _wait_history.append(WaitRecord(func.__name__, self.polls, self.duration, bool(self)))
+        LOGGER.debug(f'{func.__name__}: {self.polls} polls in {self.duration:.1f}s with {policy}')
 
         if self.error_message is None:
             self.error_message = (
@@ -4,9 +4,84 @@
 #
 #
 
+import collections
 import contextlib
+import threading
 
 from ost_utils import assert_utils
+from ost_utils import utils
+
+
+class _Settings:
+    event_bus = None
+
+
+def use_event_bus(event_bus):
+    """Makes wait_for_event use the given EngineEventBus, or poll on its own if None"""
+    _Settings.event_bus = event_bus
+
+
+class EventCursor:
+    """
+    Reads engine events incrementally
+
+    Every fetch asks only for the events newer than the newest one seen so
+    far and indexes them by their code, so waiting for several codes costs
+    a single small request per poll. A cursor may be shared by threads.
+    """
+
+    def __init__(self, events_service, last_event_id=None):
+        self._events_service = events_service
+        if last_event_id is None:
+            newest = events_service.list(max=1)
+            last_event_id = int(newest[0].id) if newest else 0
+        self.last_event_id = last_event_id
+        self._events_by_code = collections.defaultdict(list)
+        self._lock = threading.Lock()
+
+    def fetch(self):
+        """Reads the events that appeared since the last fetch and returns them"""
+        with self._lock:
+            new_events = self._read()
+            for event in new_events:
+                self._events_by_code[event.code].append(event)
+            return new_events
+
+    def read(self):
+        """Like fetch, without keeping the events, oldest first"""
+        with self._lock:
+            return self._read()
+
+    def _read(self):
+        new_events = sorted(
+            (
+                event
+                for event in self._events_service.list(from_=self.last_event_id)
+                if int(event.id) > self.last_event_id
+            ),
+            key=lambda event: int(event.id),
+        )
+        if new_events:
+            self.last_event_id = int(new_events[-1].id)
+        return new_events
+
+    def events(self, code):
+        with self._lock:
+            return list(self._events_by_code.get(code, ()))
+
+    def missing(self, codes):
+        with self._lock:
+            return [code for code in codes if code not in self._events_by_code]
+
+    def seen_all(self, codes):
+        self.fetch()
+        return not self.missing(codes)
+
+    def wait_for(self, codes, timeout=assert_utils.LONG_TIMEOUT):
+        result = assert_utils.true_within(lambda: self.seen_all(codes), timeout)
+        if not result:
+            result.error_message = f'Events {self.missing(codes)} not seen within {timeout} seconds'
+        return result
 
 
 @contextlib.contextmanager
@@ -16,18 +91,31 @@ def wait_for_event(engine, event_id, timeout=assert_utils.LONG_TIMEOUT):
     event ID or a list - multiple event IDs
     that all will be checked
     '''
-    events = engine.events_service()
-    last_event = int(events.list(max=2)[0].id)
+    if isinstance(event_id, int):
+        event_id = [event_id]
+    if _Settings.event_bus is not None:
+        with _wait_for_bus_event(_Settings.event_bus, event_id, timeout):
+            yield
+        return
+
+    cursor = EventCursor(engine.events_service())
+    try:
+        yield
+    finally:
+        assert cursor.wait_for(event_id, timeout)
+
+
+@contextlib.contextmanager
+def _wait_for_bus_event(event_bus, codes, timeout):
+    mark = event_bus.mark()
     try:
         yield
     finally:
-        if isinstance(event_id, int):
-            event_id = [event_id]
-        for e_id in event_id:
-            assert assert_utils.true_within(
-                lambda: any(e.code == e_id for e in events.list(from_=last_event)),
-                timeout,
-            )
+        with utils.EggTimer(timeout) as timer:
+            missing = [
+                code for code in codes if not event_bus.wait_for(mark, max(timeout - timer.running_time, 0), code=code)
+            ]
+        assert not missing, f'Events {missing} not seen within {timeout} seconds'
 
 
 def wait_for_event_or_expire(engine, event_id, timeout=assert_utils.LONG_TIMEOUT):
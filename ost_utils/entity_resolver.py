@@ -0,0 +1,191 @@
+#
+# Copyright oVirt Authors
+# SPDX-License-Identifier: GPL-2.0-or-later
+#
+#
+
+import collections
+import logging
+import threading
+import time
+
+import ovirtsdk4
+
+from ost_utils.ovirtlib import lookuplib
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TTL = 60
+
+# collection -> (collection service getter, entity service getter)
+COLLECTIONS = {
+    'clusters': ('clusters_service', 'cluster_service'),
+    'data_centers': ('data_centers_service', 'data_center_service'),
+    'disks': ('disks_service', 'disk_service'),
+    'networks': ('networks_service', 'network_service'),
+    'storage_domains': ('storage_domains_service', 'storage_domain_service'),
+    'templates': ('templates_service', 'template_service'),
+    'vm_pools': ('vm_pools_service', 'pool_service'),
+    'vms': ('vms_service', 'vm_service'),
+}
+
+
+def _key_of(collection_service, query):
+    # services are created on every call, they're the same collection as
+    # long as they share the connection and the path
+    return (collection_service._connection, collection_service._path, tuple(sorted((query or {}).items())))
+
+
+class _Ambiguous:
+    """Marks a name shared by several entities, i.e. template versions"""
+
+
+_AMBIGUOUS = _Ambiguous()
+
+
+class EntityResolver:
+    """
+    Resolves entity names to ids and caches the result
+
+    The first lookup in a collection lists the whole collection once and
+    remembers the ids of all the names in it, so the following lookups in
+    the collection don't go to the engine at all. Names missing from the
+    listing, or shared by several entities, are looked up with a search.
+    Collections that can't be searched, like the vms and disks of a
+    storage domain, are listed again instead. Cached ids expire after
+    'ttl' seconds.
+
+    Names are resolved through the services returned by 'service' and
+    'service_in'. They resolve the name again if the engine says the
+    entity they point to doesn't exist anymore, so an entity removed and
+    created again with the same name is picked up, and forget the name
+    when the entity is removed through them.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (connection, path, query) -> (time of listing, {name: id})
+        self._names = {}
+        self.stats = collections.Counter()
+
+    def service(self, engine, collection, name):
+        """The service of an entity in one of COLLECTIONS"""
+        collection_getter, service_getter = COLLECTIONS[collection]
+        return self.service_in(getattr(engine, collection_getter)(), service_getter, name)
+
+    def service_in(self, collection_service, service_getter, name, query=None):
+        """
+        The service of an entity in any collection, 'service_getter' is the
+        name of the collection service method returning it, i.e. 'vm_service'
+        :param query: extra query parameters of the listing, i.e. unregistered
+        """
+        return _ResolvedService(self, collection_service, service_getter, name, query)
+
+    def resolve(self, collection_service, name, query=None):
+        """Returns the id of the entity, raises LookupError if there's none"""
+        key = _key_of(collection_service, query)
+        with self._lock:
+            listed_at, names = self._names.get(key, (None, {}))
+            fresh = listed_at is not None and time.monotonic() - listed_at < self.ttl
+            entity_id = names.get(name)
+            if fresh and entity_id is not None and entity_id is not _AMBIGUOUS:
+                self.stats['hits'] += 1
+                return entity_id
+            self.stats['misses'] += 1
+
+        searchable = lookuplib.supports_search(collection_service)
+        if not fresh or not searchable:
+            names = self._prefetch(key, collection_service, query, searchable)
+            entity_id = names.get(name)
+            if entity_id is not None and entity_id is not _AMBIGUOUS:
+                return entity_id
+        if not searchable:
+            raise LookupError(f'{name} not found in {collection_service._path}')
+
+        self.count('searches')
+        entities = lookuplib.search_by_name(collection_service, name, query)
+        if not entities:
+            raise LookupError(f'{name} not found in {collection_service._path}')
+        with self._lock:
+            if key in self._names and self._names[key][1].get(name) is not _AMBIGUOUS:
+                self._names[key][1][name] = entities[0].id
+        return entities[0].id
+
+    def invalidate(self, collection_service=None, name=None):
+        """Forgets 'name', or all the names, in the collection whatever the query, or everything"""
+        with self._lock:
+            for key in list(self._names):
+                if collection_service is not None and key[:2] != _key_of(collection_service, None)[:2]:
+                    continue
+                if name is None:
+                    del self._names[key]
+                else:
+                    self._names[key][1].pop(name, None)
+
+    def count(self, stat):
+        # resolvers are shared by threads, i.e. VectorThread workers
+        with self._lock:
+            self.stats[stat] += 1
+
+    def counts(self):
+        with self._lock:
+            return dict(self.stats)
+
+    def _prefetch(self, key, collection_service, query, searchable):
+        self.count('prefetches')
+        names = {}
+        for entity in collection_service.list(query=query):
+            if entity.name not in names:
+                names[entity.name] = entity.id
+            elif searchable:
+                names[entity.name] = _AMBIGUOUS
+            # otherwise the first one wins, like looking it up in the listing would
+        with self._lock:
+            self._names[key] = (time.monotonic(), names)
+        LOGGER.debug(f'EntityResolver: prefetched {len(names)} names in {collection_service._path}')
+        return names
+
+
+class _ResolvedService:
+    """An entity service found by name, resolves the name again when the entity is gone"""
+
+    def __init__(self, resolver, collection_service, service_getter, name, query):
+        self._resolver = resolver
+        self._collection_service = collection_service
+        self._service_getter = service_getter
+        self._name = name
+        self._query = query
+        self._entity_id, self._service = self._resolve()
+
+    def _resolve(self):
+        entity_id = self._resolver.resolve(self._collection_service, self._name, self._query)
+        return entity_id, getattr(self._collection_service, self._service_getter)(entity_id)
+
+    def __getattr__(self, attr):
+        if not callable(getattr(self._service, attr)):
+            return getattr(self._service, attr)
+
+        def call(*args, **kwargs):
+            try:
+                result = getattr(self._service, attr)(*args, **kwargs)
+            except ovirtsdk4.NotFoundError as not_found:
+                self._resolver.invalidate(self._collection_service, self._name)
+                try:
+                    entity_id, service = self._resolve()
+                except LookupError:
+                    raise not_found
+                if entity_id == self._entity_id:
+                    raise
+                LOGGER.debug(f'EntityResolver: {self._name} in {self._collection_service._path} was re-created')
+                self._resolver.count('re-resolved')
+                self._entity_id, self._service = entity_id, service
+                result = getattr(self._service, attr)(*args, **kwargs)
+            if attr == 'remove':
+                self._resolver.invalidate(self._collection_service, self._name)
+            return result
+
+        return call
+
+    def __repr__(self):
+        return f'<{self._collection_service._path} {self._name}: {self._service!r}>'
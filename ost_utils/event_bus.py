@@ -0,0 +1,206 @@
+#
+# Copyright oVirt Authors
+# SPDX-License-Identifier: GPL-2.0-or-later
+#
+#
+
+import collections
+import logging
+import threading
+import time
+
+from ost_utils import engine_utils
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 1
+DEFAULT_CAPACITY = 10000
+
+# links of an event to the entities it's about
+_ENTITY_KINDS = ('cluster', 'data_center', 'host', 'storage_domain', 'template', 'user', 'vm')
+
+
+def _index_keys(event):
+    keys = [('code', event.code)]
+    if event.correlation_id:
+        keys.append(('correlation_id', event.correlation_id))
+    for kind in _ENTITY_KINDS:
+        entity = getattr(event, kind, None)
+        if entity is not None and entity.id:
+            keys.append(('entity', kind, entity.id))
+    return keys
+
+
+def _query_key(code, entity, correlation_id):
+    if code is not None:
+        return ('code', code)
+    if correlation_id is not None:
+        return ('correlation_id', correlation_id)
+    if entity is not None:
+        return ('entity',) + tuple(entity)
+    return None
+
+
+class _EventRing:
+    """The most recent 'capacity' events, oldest first, and their indexes"""
+
+    def __init__(self, capacity, last_event_id):
+        self.capacity = capacity
+        self.last_event_id = last_event_id
+        self._events = collections.deque()
+        self._index = collections.defaultdict(collections.deque)
+
+    def add(self, event):
+        if len(self._events) == self.capacity:
+            oldest = self._events.popleft()
+            for key in _index_keys(oldest):
+                # the oldest event is the first one in all its indexes
+                self._index[key].popleft()
+                if not self._index[key]:
+                    del self._index[key]
+        self._events.append(event)
+        for key in _index_keys(event):
+            self._index[key].append(event)
+        self.last_event_id = int(event.id)
+
+    def candidates(self, key):
+        return self._index.get(key, ()) if key is not None else self._events
+
+
+class _Tail:
+    """Calls 'fetch' every 'interval' seconds from a thread of its own"""
+
+    def __init__(self, fetch, interval):
+        self._fetch = fetch
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='engine-event-bus', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            try:
+                self._fetch()
+            except Exception as e:
+                LOGGER.warning(f'EngineEventBus: fetching events failed, will retry: {e}')
+
+
+class EngineEventBus:
+    """
+    Tails the engine events for the whole session
+
+    A background thread fetches the events newer than the newest one seen
+    so far and keeps the most recent 'capacity' of them, indexed by code,
+    correlation id and the entities they're about. Tests take a mark before
+    doing something and then ask about the events that happened since:
+
+        mark = bus.mark()
+        do_something()
+        assert bus.wait_for(mark, timeout=600, code=956)
+
+    'entity' is a (kind, id) pair, i.e. ('vm', vm_id). Subscribers are
+    called with every new matching event, from the thread that fetched it.
+    The bus should have a connection of its own, ovirtsdk4 connections
+    must not be used from several threads at once.
+    """
+
+    def __init__(self, events_service, interval=DEFAULT_INTERVAL, capacity=DEFAULT_CAPACITY):
+        self._cursor = engine_utils.EventCursor(events_service)
+        self._ring = _EventRing(capacity, self._cursor.last_event_id)
+        self._subscribers = []
+        self._fetch_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._tail = _Tail(self.fetch, interval)
+        self.fetches = 0
+
+    @property
+    def last_event_id(self):
+        return self._ring.last_event_id
+
+    def start(self):
+        self._tail.start()
+
+    def stop(self):
+        self._tail.stop()
+        LOGGER.debug(f'EngineEventBus: {self.fetches} fetches, last event {self.last_event_id}')
+
+    def mark(self):
+        """Returns a mark of the current moment, events newer than it happened after it"""
+        self.fetch()
+        return self.last_event_id
+
+    def since(self, mark, code=None, entity=None, correlation_id=None):
+        """Returns the events newer than 'mark' matching all the given criteria, oldest first"""
+        with self._cond:
+            return self._matching(mark, code, entity, correlation_id)
+
+    def happened_since(self, mark, code=None, entity=None, correlation_id=None):
+        self.fetch()
+        return bool(self.since(mark, code, entity, correlation_id))
+
+    def wait_for(self, mark, timeout, code=None, entity=None, correlation_id=None):
+        """Waits for an event newer than 'mark' matching the criteria, returns the matching events"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                events = self._matching(mark, code, entity, correlation_id)
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0:
+                    return events
+                self._cond.wait(remaining)
+
+    def subscribe(self, callback, code=None, entity=None, correlation_id=None):
+        subscriber = (callback, code, entity, correlation_id)
+        with self._cond:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._cond:
+            self._subscribers.remove(subscriber)
+
+    def fetch(self):
+        """Reads the events that appeared since the last fetch"""
+        with self._fetch_lock:
+            # the ring below is what keeps the events, not the cursor
+            new_events = self._cursor.read()
+            self.fetches += 1
+            if not new_events:
+                return
+            with self._cond:
+                for event in new_events:
+                    self._ring.add(event)
+                subscribers = list(self._subscribers)
+                self._cond.notify_all()
+        for callback, code, entity, correlation_id in subscribers:
+            for event in new_events:
+                if self._matches(event, code, entity, correlation_id):
+                    try:
+                        callback(event)
+                    except Exception:
+                        # one failing subscriber doesn't keep the others from their events
+                        LOGGER.exception(f'EngineEventBus: subscriber {callback} failed on event {event.id}')
+
+    def _matching(self, mark, code, entity, correlation_id):
+        return [
+            event
+            for event in self._ring.candidates(_query_key(code, entity, correlation_id))
+            if int(event.id) > mark and self._matches(event, code, entity, correlation_id)
+        ]
+
+    @staticmethod
+    def _matches(event, code, entity, correlation_id):
+        keys = _index_keys(event)
+        return (
+            (code is None or ('code', code) in keys)
+            and (correlation_id is None or ('correlation_id', correlation_id) in keys)
+            and (entity is None or ('entity',) + tuple(entity) in keys)
+        )
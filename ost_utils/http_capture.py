@@ -0,0 +1,171 @@
+#
+# Copyright oVirt Authors
+# SPDX-License-Identifier: GPL-2.0-or-later
+#
+#
+
+import collections
+import logging
+import re
+import threading
+import time
+
+import ovirtsdk4 as sdk4
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 50
+DEFAULT_BODY_LIMIT = 2048
+# capture: keep the last calls in memory, full: the old debug=True
+MODES = ('capture', 'full', 'off')
+
+_ID_SEGMENT = re.compile(r'^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+)$')
+
+Exchange = collections.namedtuple(
+    'Exchange',
+    'started method path query code latency request_size response_size request_body response_body',
+)
+
+
+def _endpoint(method, path):
+    return f'{method} ' + '/'.join('{id}' if _ID_SEGMENT.match(part) else part for part in path.split('/'))
+
+
+def _size(body):
+    return len(body) if body else 0
+
+
+def _text(body):
+    if isinstance(body, bytes):
+        return body.decode('utf-8', errors='replace')
+    return body or ''
+
+
+class HttpCapture:
+    """
+    Keeps the last 'capacity' engine API calls and counters per endpoint
+
+    Calls are stored as they are, with bodies cut to 'body_limit' bytes,
+    they're only formatted when dumped - i.e. when a test fails.
+    Endpoints are the method and the path with the ids left out.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, body_limit=DEFAULT_BODY_LIMIT):
+        self.body_limit = body_limit
+        self._lock = threading.Lock()
+        self._exchanges = collections.deque(maxlen=capacity)
+        # endpoint -> [calls, total latency, max latency, response bytes]
+        self._endpoints = collections.defaultdict(lambda: [0, 0.0, 0.0, 0])
+
+    def record(self, request, response, started, latency):
+        exchange = Exchange(
+            started=started,
+            method=request.method,
+            path=request.path,
+            query=request.query,
+            code=response.code if response is not None else None,
+            latency=latency,
+            request_size=_size(request.body),
+            response_size=_size(response.body) if response is not None else 0,
+            request_body=request.body[: self.body_limit] if request.body else None,
+            response_body=response.body[: self.body_limit] if response is not None and response.body else None,
+        )
+        with self._lock:
+            self._exchanges.append(exchange)
+            counters = self._endpoints[_endpoint(request.method, request.path)]
+            counters[0] += 1
+            counters[1] += latency
+            counters[2] = max(counters[2], latency)
+            counters[3] += exchange.response_size
+
+    def exchanges(self):
+        with self._lock:
+            return list(self._exchanges)
+
+    def endpoint_stats(self):
+        with self._lock:
+            return {
+                endpoint: {'calls': calls, 'total_time': total, 'max_time': slowest, 'response_bytes': size}
+                for endpoint, (calls, total, slowest, size) in self._endpoints.items()
+            }
+
+    def dump(self):
+        lines = []
+        for exchange in self.exchanges():
+            started = time.strftime('%H:%M:%S', time.localtime(exchange.started))
+            lines.append(
+                f'{started} {exchange.method} {exchange.path} {exchange.query or ""} -> {exchange.code} '
+                f'in {exchange.latency:.3f}s, sent {exchange.request_size}B, received {exchange.response_size}B'
+            )
+            if exchange.request_body:
+                lines.append(f'  request: {_text(exchange.request_body)}')
+            if exchange.response_body:
+                lines.append(f'  response: {_text(exchange.response_body)}')
+        return '\n'.join(lines)
+
+    def report(self):
+        stats = sorted(self.endpoint_stats().items(), key=lambda item: item[1]['total_time'], reverse=True)
+        return '\n'.join(
+            f'{endpoint}: {s["calls"]} calls, {s["total_time"]:.2f}s total, {s["max_time"]:.2f}s max, '
+            f'{s["response_bytes"]}B received'
+            for endpoint, s in stats
+        )
+
+
+class CapturingConnection(sdk4.Connection):
+    """A connection recording its calls in a HttpCapture instead of logging them"""
+
+    def __init__(self, *args, capture, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._capture = capture
+        # id of the send context -> (request, wall clock start, monotonic start)
+        self._pending = {}
+
+    def send(self, request):
+        started = (request, time.time(), time.monotonic())
+        context = super().send(request)
+        self._pending[id(context)] = started
+        return context
+
+    def wait(self, context, *args, **kwargs):
+        request, started, start = self._pending.pop(id(context), (None, None, None))
+        response = None
+        try:
+            response = super().wait(context, *args, **kwargs)
+            return response
+        finally:
+            if request is not None:
+                self._capture.record(request, response, started, time.monotonic() - start)
+
+
+class _Settings:
+    mode = 'capture'
+    capture = HttpCapture()
+
+
+def configure(mode, capacity=DEFAULT_CAPACITY):
+    if mode not in MODES:
+        raise ValueError(f'Unknown sdk debug mode {mode}, expected one of {MODES}')
+    _Settings.mode = mode
+    _Settings.capture = HttpCapture(capacity)
+
+
+def capturing():
+    return _Settings.mode == 'capture'
+
+
+def capture():
+    return _Settings.capture
+
+
+def connect(capture=None, **connection_args):
+    """
+    Opens an sdk connection debugged according to the configured mode
+    :param capture: the HttpCapture recording its calls in capture mode,
+    the one shown on failures if not given
+    """
+    if _Settings.mode == 'full':
+        return sdk4.Connection(debug=True, **connection_args)
+    if _Settings.mode == 'capture':
+        return CapturingConnection(capture=capture or _Settings.capture, **connection_args)
+    return sdk4.Connection(**connection_args)
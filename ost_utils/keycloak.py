@@ -5,7 +5,7 @@
 #
 
 
-import ovirtsdk4 as sdk4
+from ost_utils import http_capture
 
 # Keycloak
 KCADM = 'KC_OPTS="-Dcom.redhat.fips=false " /usr/share/ovirt-engine-wildfly/bin/kcadm.sh'
@@ -33,12 +33,11 @@ def create_user(ansible_engine, realm, username, password):
 def activate_user(engine_api_url, username, password, profile):
     # In order to sync Keycloak user with Engine db we need at least an attempt to authenticate
     # and access some protected resources
-    api = sdk4.Connection(
+    api = http_capture.connect(
         url=engine_api_url,
         username=f'{username}@{profile}',
         password=password,
         insecure=True,
-        debug=True,
     )
     api.test(raise_exception=False)
 
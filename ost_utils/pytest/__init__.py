@@ -8,6 +8,10 @@ import logging
 
 import pytest
 
+from ost_utils import assert_utils
+from ost_utils import http_capture
+from ost_utils import ssh
+
 
 LOGGER = logging.getLogger(__name__)
 
@@ -16,6 +20,70 @@ def pytest_addoption(parser):
     parser.addoption('--custom-repo', action='append')
     parser.addoption('--skip-custom-repos-check', action='store_true')
     parser.addoption('--vdsm-coverage', action='store_true')
+    parser.addoption(
+        '--ansible-workers',
+        type=int,
+        default=0,
+        help='Number of warm ansible worker processes to run module calls in (0 disables the pool)',
+    )
+    parser.addoption(
+        '--ansible-strategy',
+        choices=('linear', 'free'),
+        default=None,
+        help='Ansible strategy for module calls, ansible\'s default (linear) if not given',
+    )
+    parser.addoption(
+        '--assert-polling',
+        choices=('backoff', 'fixed'),
+        default='backoff',
+        help='How assert_utils waits poll: exponential backoff or the old fixed 3 second interval',
+    )
+    parser.addoption(
+        '--buffered-sync-audit',
+        action='store_true',
+        help='Post the engine events auditing ovirtlib sync retries in batches instead of one per retry',
+    )
+    parser.addoption(
+        '--engine-api-connections',
+        type=int,
+        default=4,
+        help='Number of engine API connections tests making engine calls from several threads can use at once',
+    )
+    parser.addoption(
+        '--engine-event-bus',
+        action='store_true',
+        help='Wait for engine events through one event bus tailing them for the whole session',
+    )
+    parser.addoption(
+        '--sdk-debug',
+        choices=http_capture.MODES,
+        default='capture',
+        help='capture: keep the last engine API calls in memory and show them when a test fails, '
+        'full: log every call (debug=True), off: neither',
+    )
+
+
+def pytest_configure(config):
+    if config.getoption('--assert-polling') == 'fixed':
+        assert_utils.set_default_policy(assert_utils.FixedInterval(3))
+    config.add_cleanup(_close_ssh_connections)
+    http_capture.configure(config.getoption('--sdk-debug'))
+    if http_capture.capturing():
+        config.add_cleanup(lambda: LOGGER.info(f'Engine API calls by endpoint:\n{http_capture.capture().report()}'))
+
+
+def _close_ssh_connections():
+    pool = ssh.connection_pool()
+    LOGGER.debug(f'Closing pooled ssh connections: {pool.stats()}')
+    pool.close_all()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.failed and http_capture.capturing():
+        report.sections.append(('Last engine API calls', http_capture.capture().dump()))
 
 
 def pytest_collection_modifyitems(session, config, items):
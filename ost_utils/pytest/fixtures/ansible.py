@@ -5,13 +5,18 @@
 # -*- coding: utf-8 -*-
 #
 
+import os
+
 import pytest
 
 from ost_utils import ansible
+from ost_utils.ansible import async_mappers
 from ost_utils.ansible import inventory
 from ost_utils.ansible import module_mappers
 from ost_utils.ansible import private_dir
+from ost_utils.ansible import worker_pool
 from ost_utils.ansible.facts import Facts
+from ost_utils.ansible.facts import FactsService
 
 from ost_utils.pytest.fixtures.artifacts import artifacts_dir
 
@@ -47,10 +52,22 @@ def ansible_host1(ansible_by_hostname, host1_hostname):
 
 
 @pytest.fixture(scope="session")
-def ansible_by_hostname(ansible_inventory):
-    def module_mapper_for(host_pattern):
+def ansible_strategy(request):
+    return request.config.getoption('--ansible-strategy')
+
+
+@pytest.fixture(scope="session")
+def ansible_by_hostname(ansible_inventory, ansible_worker_pool, ansible_strategy, all_hostnames):
+    def module_mapper_for(host_pattern, hosts_count):
         inventory = ansible_inventory.dir
-        return module_mappers.ModuleMapper(inventory, host_pattern)
+        # let ansible handle all the matched hosts at once
+        # instead of being capped by its default of 5 forks
+        return module_mappers.ModuleMapper(
+            inventory,
+            host_pattern,
+            forks=hosts_count,
+            strategy=ansible_strategy,
+        )
 
     def seq_to_ansible_pattern(seq):
         # https://docs.ansible.com/ansible/latest/user_guide/intro_patterns.html#using-regexes-in-patterns
@@ -70,32 +87,54 @@ def ansible_by_hostname(ansible_inventory):
     def get_ansible_by_hostname(names):
         # names should be either a string (and then we use it directly)
         # or a tuple/list (and then we concatenate to create a pattern)
-        host_pattern = (
-            short_name(names) if isinstance(names, str) else seq_to_ansible_pattern(short_name(name) for name in names)
-        )
-        return module_mapper_for(host_pattern)
+        if isinstance(names, str):
+            host_pattern = short_name(names)
+            hosts_count = len(all_hostnames) if names == "*" else 1
+        else:
+            names = list(names)
+            host_pattern = seq_to_ansible_pattern(short_name(name) for name in names)
+            hosts_count = len(names)
+        return module_mapper_for(host_pattern, max(hosts_count, 1))
 
     return get_ansible_by_hostname
 
 
 @pytest.fixture(scope="session")
-def ansible_engine_facts(ansible_engine):
-    return Facts(ansible_engine)
+def ansible_facts_service(ansible_all, all_hostnames, working_dir):
+    return FactsService(
+        ansible_all,
+        all_hostnames,
+        cache_path=os.path.join(working_dir, 'ansible_facts.json'),
+    )
+
+
+@pytest.fixture(scope="session")
+def ansible_async(ansible_worker_pool):
+    async_runner = async_mappers.AsyncRunner()
+    try:
+        yield async_runner
+    finally:
+        async_runner.close()
 
 
 @pytest.fixture(scope="session")
-def ansible_storage_facts(ansible_storage):
-    return Facts(ansible_storage)
+def ansible_engine_facts(ansible_engine, ansible_facts_service):
+    return Facts(ansible_engine, ansible_facts_service)
 
 
 @pytest.fixture(scope="session")
-def ansible_host0_facts(ansible_host0):
-    return Facts(ansible_host0)
+def ansible_storage_facts(ansible_storage, ansible_facts_service):
+    return Facts(ansible_storage, ansible_facts_service)
 
 
 @pytest.fixture(scope="session")
-def ansible_host1_facts(ansible_host1):
-    return Facts(ansible_host1)
+def ansible_host0_facts(ansible_host0, ansible_facts_service):
+    return Facts(ansible_host0, ansible_facts_service)
+
+
+@pytest.fixture(scope="session")
+def ansible_host1_facts(ansible_host1, ansible_facts_service):
+    return Facts(ansible_host1, ansible_facts_service)
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -104,6 +143,20 @@ def ansible_clean_private_dirs():
     private_dir.PrivateDir.cleanup()
 
 
+@pytest.fixture(scope="session")
+def ansible_worker_pool(request, ansible_clean_private_dirs):
+    size = request.config.getoption('--ansible-workers')
+    if not size:
+        yield None
+        return
+    pool = worker_pool.WorkerPool(size)
+    pool.start()
+    try:
+        yield pool
+    finally:
+        pool.stop()
+
+
 @pytest.fixture(scope="session", autouse=True)
 def ansible_collect_logs(artifacts_dir, ansible_clean_private_dirs):
     yield
@@ -111,7 +164,16 @@ def ansible_collect_logs(artifacts_dir, ansible_clean_private_dirs):
 
 
 @pytest.fixture(scope="session")
-def ansible_inventory(backend, working_dir):
+def ansible_ssh_multiplexing():
+    return True
+
+
+@pytest.fixture(scope="session")
+def ansible_inventory(backend, working_dir, ansible_ssh_multiplexing):
     inv = inventory.Inventory(working_dir)
     inv.add('backend', backend.ansible_inventory_str())
+    if ansible_ssh_multiplexing:
+        inv.add_ssh_multiplexing(private_dir.PrivateDir.get_ssh_control_dir())
+    else:
+        inv.discard(inventory.SSH_MULTIPLEXING_INVENTORY)
     return inv
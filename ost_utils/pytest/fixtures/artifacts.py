@@ -4,14 +4,13 @@
 #
 #
 
-import functools
+import asyncio
 import logging
 import os
 
 import pytest
 
 from ost_utils import coverage
-from ost_utils import utils
 from ost_utils import shell
 from ost_utils.ansible import AnsibleExecutionError
 
@@ -31,15 +30,15 @@ def collect_artifacts(root_dir):
 
 
 @pytest.fixture(scope="session", autouse=True)
-def generate_sar_stat_plots(collect_artifacts, ansible_all, ansible_by_hostname, artifacts_dir):
-    def generate(hostname):
-        ansible_handle = ansible_by_hostname(hostname)
+def generate_sar_stat_plots(collect_artifacts, ansible_all, ansible_by_hostname, ansible_async, artifacts_dir):
+    async def generate(hostname):
+        ansible_handle = ansible_async.mapper(ansible_by_hostname(hostname))
         try:
             # DEV and EDEV statistics are excluded, since they contain
             # the iface names - semicolons in ';vdsmdummy;' iface name cause
             # sadf to fail.
             # TODO: change the name of the iface in question
-            ansible_handle.shell(
+            await ansible_handle.shell(
                 'sadf -g -- -bBdFHqSuvwWy -I SUM -I ALL -m ALL -n NFS,NFSD,'
                 'SOCK,IP,EIP,ICMP,EICMP,TCP,ETCP,UDP,SOCK6,IP6,EIP6,ICMP6,'
                 'EICMP6,UDP6 -r ALL -u ALL -P ALL > /var/tmp/sarstat.svg'
@@ -48,15 +47,17 @@ def generate_sar_stat_plots(collect_artifacts, ansible_all, ansible_by_hostname,
             # sar error should not fail the run
             LOGGER.error(f"Failed generating sar report on '{hostname}': {err}")
         else:
-            ansible_handle.fetch(
+            await ansible_handle.fetch(
                 src='/var/tmp/sarstat.svg',
                 dest=f'{artifacts_dir}/{hostname}.sarstat.svg',
                 flat=True,
             )
 
+    async def generate_all(hostnames):
+        await asyncio.gather(*(generate(hostname) for hostname in hostnames))
+
     yield
-    calls = [functools.partial(generate, res['stdout']) for res in ansible_all.shell("hostname").values()]
-    utils.invoke_different_funcs_in_parallel(*calls)
+    asyncio.run(generate_all([res['stdout'] for res in ansible_all.shell("hostname").values()]))
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -46,56 +46,59 @@ def run_scripts(ansible_by_hostname, root_dir):
 @pytest.fixture(scope="session")
 def set_sar_interval(ansible_all, root_dir):
     def do_set_sar_interval():
-        ansible_all.file(
-            path='/etc/systemd/system/sysstat-collect.timer.d',
-            state='directory',
-        )
         sar_stat_src_dir = os.path.join(root_dir, 'common/sar_stat')
-        ansible_all.copy(
-            src=os.path.join(sar_stat_src_dir, 'override.conf'),
-            dest='/etc/systemd/system/sysstat-collect.timer.d',
-        )
-        ansible_all.systemd(
-            daemon_reload='yes',
-            name='sysstat-collect.timer',
-            state='started',
-            enabled='yes',
-        )
+        with ansible_all.batch() as batch:
+            batch.file(
+                path='/etc/systemd/system/sysstat-collect.timer.d',
+                state='directory',
+            )
+            batch.copy(
+                src=os.path.join(sar_stat_src_dir, 'override.conf'),
+                dest='/etc/systemd/system/sysstat-collect.timer.d',
+            )
+            batch.systemd(
+                daemon_reload='yes',
+                name='sysstat-collect.timer',
+                state='started',
+                enabled='yes',
+            )
 
     return do_set_sar_interval
 
 
 def start_sshd_proxy(vms, host, root_dir, ssh_key_file):
-    vms.copy(
-        src=ssh_key_file,
-        dest='/root/.ssh/id_rsa',
-        mode='0600',
-    )
-    vms.copy(
-        src=os.path.join(root_dir, 'common/helpers/sshd_proxy.service'),
-        dest='/etc/systemd/system/sshd_proxy.service',
-    )
     user = getpass.getuser()
-    vms.copy(
-        dest='/usr/local/sbin/sshd_proxy.sh',
-        content=f'"#!/bin/bash\\nssh -D 1234 -p2222 -N -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null -i /root/.ssh/id_rsa {user}@{host}"',
-        mode='0655',
-    )
-    vms.systemd(
-        daemon_reload='yes',
-        name='sshd_proxy.service',
-        state='started',
-        enabled='yes',
-    )
-    vms.lineinfile(
-        path='/etc/dnf/dnf.conf',
-        line='"proxy=socks5://localhost:1234\\nip_resolve=4"',
-    )
+    with vms.batch() as batch:
+        batch.copy(
+            src=ssh_key_file,
+            dest='/root/.ssh/id_rsa',
+            mode='0600',
+        )
+        batch.copy(
+            src=os.path.join(root_dir, 'common/helpers/sshd_proxy.service'),
+            dest='/etc/systemd/system/sshd_proxy.service',
+        )
+        batch.copy(
+            dest='/usr/local/sbin/sshd_proxy.sh',
+            content=f'"#!/bin/bash\\nssh -D 1234 -p2222 -N -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null -i /root/.ssh/id_rsa {user}@{host}"',
+            mode='0655',
+        )
+        batch.systemd(
+            daemon_reload='yes',
+            name='sshd_proxy.service',
+            state='started',
+            enabled='yes',
+        )
+        batch.lineinfile(
+            path='/etc/dnf/dnf.conf',
+            line='"proxy=socks5://localhost:1234\\nip_resolve=4"',
+        )
 
 
 @pytest.fixture(scope="session", autouse=True)
 def deploy(
     ansible_all,
+    ansible_facts_service,
     ansible_hosts,
     deploy_scripts,
     deploy_hosted_engine,
@@ -172,6 +175,9 @@ def deploy(
     # setup sar stat utility
     set_sar_interval()
 
+    # hostnames and repos have changed, don't trust facts gathered before
+    ansible_facts_service.invalidate()
+
     # mark env as deployed
     deployment_utils.mark_as_deployed(working_dir)
     LOGGER.info("Environment deployed")
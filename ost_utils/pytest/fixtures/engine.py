@@ -9,12 +9,13 @@ import os
 import tempfile
 import time
 
-import ovirtsdk4 as sdk4
 import ovirtsdk4.types as types
 import pytest
 
 from ost_utils import assert_utils
+from ost_utils import http_capture
 from ost_utils import network_utils
+from ost_utils import sdk_pool
 from ost_utils.ansible import AnsibleExecutionError
 from ost_utils.shell import shell
 from ost_utils.shell import ShellError
@@ -120,12 +121,11 @@ def nonadmin_password():
 
 @pytest.fixture(scope="session")
 def engine_api(engine_full_username, engine_password, engine_api_url):
-    api = sdk4.Connection(
+    api = http_capture.connect(
         url=engine_api_url,
         username=engine_full_username,
         password=engine_password,
         insecure=True,
-        debug=True,
     )
     for _ in range(20):
         if not api.test():
@@ -135,6 +135,21 @@ def engine_api(engine_full_username, engine_password, engine_api_url):
     raise RuntimeError("Test API call failed")
 
 
+@pytest.fixture(scope="session")
+def engine_api_pool(request, engine_api, engine_full_username, engine_password, engine_api_url):
+    # engine_api makes sure the API is up before the pool connects,
+    # use the pool for engine calls made from several threads at once
+    pool = sdk_pool.EngineConnectionPool(
+        url=engine_api_url,
+        username=engine_full_username,
+        password=engine_password,
+        size=request.config.getoption('--engine-api-connections'),
+        insecure=True,
+    )
+    yield pool
+    pool.close()
+
+
 @pytest.fixture(scope="session")
 def engine_cert(engine_fqdn, engine_ip_url):
     with tempfile.NamedTemporaryFile(prefix="engine-cert", suffix=".pem") as cert_file:
@@ -6,6 +6,11 @@
 
 import pytest
 
+from ost_utils import engine_utils
+from ost_utils import event_bus as eb
+from ost_utils import http_capture
+from ost_utils import status_poller as sp
+
 
 @pytest.fixture(scope="session")
 def system_service(engine_api):
@@ -101,3 +106,51 @@ def get_disk_services_for_vm_or_template(disks_service):
         return disks_service_list
 
     return service_for
+
+
+@pytest.fixture(scope="session")
+def status_poller(engine_api, engine_full_username, engine_password, engine_api_url):
+    # the poller runs in its own thread, so it gets its own connection
+    connection = _connect(engine_api_url, engine_full_username, engine_password)
+    poller = sp.StatusPoller(connection.system_service())
+    yield poller
+    poller.stop()
+    connection.close()
+
+
+@pytest.fixture(scope="session")
+def engine_event_bus(engine_api, engine_full_username, engine_password, engine_api_url):
+    connection = _connect(engine_api_url, engine_full_username, engine_password)
+    bus = eb.EngineEventBus(connection.system_service().events_service())
+    bus.start()
+    yield bus
+    bus.stop()
+    connection.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def engine_event_bus_waits(request):
+    # decided once for the whole session, so all the wait_for_event calls
+    # behave the same whichever tests run
+    if not request.config.getoption('--engine-event-bus'):
+        yield
+        return
+    engine_utils.use_event_bus(request.getfixturevalue('engine_event_bus'))
+    try:
+        yield
+    finally:
+        engine_utils.use_event_bus(None)
+
+
+def _connect(engine_api_url, engine_full_username, engine_password):
+    # a connection of its own for a fixture using the engine from another
+    # thread, ovirtsdk4 connections must not be shared between threads.
+    # Its calls are captured apart too, polling every second they'd push
+    # the test's own calls out of the ones shown when it fails
+    return http_capture.connect(
+        capture=http_capture.HttpCapture(),
+        url=engine_api_url,
+        username=engine_full_username,
+        password=engine_password,
+        insecure=True,
+    )
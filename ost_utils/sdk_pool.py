@@ -0,0 +1,225 @@
+#
+# Copyright oVirt Authors
+# SPDX-License-Identifier: GPL-2.0-or-later
+#
+#
+
+import collections
+import contextlib
+import itertools
+import logging
+import threading
+import time
+
+import ovirtsdk4 as sdk4
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 4
+# connections idle for longer than that are tested before being handed out
+HEALTH_CHECK_INTERVAL = 60
+
+
+class _CountingConnection(sdk4.Connection):
+    """A connection that counts the requests sent over it"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests = collections.Counter()
+
+    def send(self, request):
+        self.requests[request.method] += 1
+        return super().send(request)
+
+
+class _PooledConnection:
+    def __init__(self, index, connection):
+        self.index = index
+        self.connection = connection
+        # the token it had when last seen by the pool
+        self.token = None
+        self.checkouts = 0
+        self.last_used = time.monotonic()
+
+    def stats(self):
+        return {
+            'connection': self.index,
+            'checkouts': self.checkouts,
+            'requests': sum(self.connection.requests.values()),
+            'by_method': dict(self.connection.requests),
+        }
+
+
+class _Login:
+    """Opens connections sharing the SSO token it last saw"""
+
+    def __init__(self, connection_args):
+        self._connection_args = connection_args
+        self._lock = threading.Lock()
+        self._token = None
+
+    def connect(self):
+        with self._lock:
+            if self._token is None:
+                connection = _CountingConnection(**self._connection_args)
+                self._token = connection.authenticate()
+                return connection
+        # username and password are still passed, so it can log in again
+        # if the token expires
+        return _CountingConnection(token=self._token, **self._connection_args)
+
+    def share(self, token):
+        with self._lock:
+            self._token = token
+
+    def forget(self, token):
+        """The next connection logs in again if 'token' is the shared one"""
+        with self._lock:
+            if token == self._token:
+                self._token = None
+
+
+class _Slots:
+    """Up to 'size' pooled connections, handed out to one thread at a time"""
+
+    def __init__(self, size):
+        self.size = size
+        self.waits = 0
+        self._cond = threading.Condition()
+        self._idle = collections.deque()
+        self._all = []
+        self._indexes = itertools.count()
+
+    def take(self):
+        """Returns an idle connection, or a new one with no sdk connection yet"""
+        with self._cond:
+            while not self._idle and len(self._all) >= self.size:
+                self.waits += 1
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            pooled = _PooledConnection(next(self._indexes), None)
+            self._all.append(pooled)
+            return pooled
+
+    def give_back(self, pooled):
+        with self._cond:
+            if pooled in self._all:
+                self._idle.append(pooled)
+                self._cond.notify()
+
+    def drop(self, pooled):
+        with self._cond:
+            self._all.remove(pooled)
+            self._cond.notify()
+
+    def connected(self):
+        with self._cond:
+            return [pooled for pooled in self._all if pooled.connection is not None]
+
+    def clear(self):
+        with self._cond:
+            connected = [pooled for pooled in self._all if pooled.connection is not None]
+            self._all.clear()
+            self._idle.clear()
+            return connected
+
+
+class EngineConnectionPool:
+    """
+    Hands out engine API connections, one per thread at a time
+
+    ovirtsdk4 connections must not be used from several threads at once,
+    so threads running engine calls in parallel take a connection of their
+    own from the pool:
+
+        with pool.connection() as connection:
+            connection.system_service().storage_domains_service().add(...)
+
+    Up to 'size' connections are opened, on demand. Threads asking for one
+    when all of them are taken wait for one to be returned. A thread that
+    already holds a connection gets the same one again. New connections
+    share the SSO token the pool last saw, so they don't log in on their
+    own, and they're kept open - and tested if idle for a while - until
+    close(), which logs every token out once.
+    """
+
+    def __init__(self, url, username, password, size=DEFAULT_POOL_SIZE, **connection_args):
+        self._login = _Login(dict(url=url, username=username, password=password, **connection_args))
+        self._slots = _Slots(size)
+        self._held = threading.local()
+
+    @property
+    def size(self):
+        return self._slots.size
+
+    @property
+    def waits(self):
+        return self._slots.waits
+
+    @contextlib.contextmanager
+    def connection(self):
+        held = getattr(self._held, 'connection', None)
+        if held is not None:
+            yield held.connection
+            return
+        pooled = self._checkout()
+        self._held.connection = pooled
+        try:
+            yield pooled.connection
+        finally:
+            self._held.connection = None
+            self._checkin(pooled)
+
+    def run(self, func, *args, **kwargs):
+        """Calls func(connection, *args, **kwargs) with a connection from the pool"""
+        with self.connection() as connection:
+            return func(connection, *args, **kwargs)
+
+    def stats(self):
+        return [pooled.stats() for pooled in self._slots.connected()]
+
+    def close(self):
+        connections = self._slots.clear()
+        stats = [pooled.stats() for pooled in connections]
+        LOGGER.debug(f'EngineConnectionPool: {self.waits} waits for a connection, {stats}')
+        # logging out revokes the token for all the connections sharing it,
+        # so each token, shared or got by logging in again, is logged out once
+        logged_out = set()
+        for pooled in connections:
+            token = pooled.connection.authenticate()
+            pooled.connection.close(logout=token not in logged_out)
+            logged_out.add(token)
+
+    def _checkout(self):
+        pooled = self._slots.take()
+        try:
+            if pooled.connection is None:
+                pooled.connection = self._login.connect()
+            elif time.monotonic() - pooled.last_used > HEALTH_CHECK_INTERVAL and not pooled.connection.test():
+                LOGGER.debug(f'EngineConnectionPool: connection {pooled.index} failed the test, reconnecting')
+                # the shared token is likely the one that stopped working,
+                # the replacement logs in again
+                self._login.forget(pooled.connection.authenticate())
+                pooled.connection.close(logout=False)
+                pooled.connection = None
+                pooled.connection = self._login.connect()
+            pooled.token = pooled.connection.authenticate()
+        except Exception:
+            # give the slot back, the next checkout connects again
+            self._slots.drop(pooled)
+            raise
+        pooled.checkouts += 1
+        return pooled
+
+    def _checkin(self, pooled):
+        pooled.last_used = time.monotonic()
+        # ovirtsdk4 logs a connection in again by itself when its token is
+        # rejected, the new token is the one to share from now on.
+        # authenticate() just returns the token of a connection that has one
+        token = pooled.connection.authenticate()
+        if token != pooled.token:
+            LOGGER.debug(f'EngineConnectionPool: connection {pooled.index} logged in again')
+            pooled.token = token
+            self._login.share(token)
+        self._slots.give_back(pooled)
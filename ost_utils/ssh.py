@@ -3,11 +3,16 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 #
 import array
+import collections
+import contextlib
 import fcntl
+import io
 import select
+import signal
 import socket
 import sys
 import termios
+import threading
 import time
 import uuid
 import logging
@@ -19,6 +24,7 @@ from ost_utils import utils
 
 SSH_TIMEOUT_DEFAULT = 100
 SSH_TRIES_DEFAULT = 20
+SSH_POOL_HEALTH_CHECK_INTERVAL = 30
 LOGGER = logging.getLogger(__name__)
 logging.getLogger('paramiko.transport').setLevel(logging.WARNING)
 
@@ -33,9 +39,18 @@ def ssh(
     ssh_key=None,
     username='root',
     password='vagrant',
+    pooled=True,
+    output_callback=None,
 ):
+    """
+    Run a command over ssh
+
+    With 'pooled', the connection to the endpoint is taken from (and left
+    in) the connection pool, so only a new channel is opened for the
+    command. Otherwise a new connection is made and closed afterwards.
+    """
     host_name = host_name or ip_addr
-    client = get_ssh_client(
+    connect_args = dict(
         ip_addr=ip_addr,
         host_name=host_name,
         ssh_tries=tries,
@@ -43,8 +58,12 @@ def ssh(
         username=username,
         password=password,
     )
-    transport = client.get_transport()
-    channel = transport.open_session()
+    if pooled:
+        client = None
+        channel = _pool.open_session(**connect_args)
+    else:
+        client = get_ssh_client(**connect_args)
+        channel = client.get_transport().open_session()
     joined_command = ' '.join(command)
     command_id = _gen_ssh_command_id()
     LOGGER.debug(
@@ -58,10 +77,14 @@ def ssh(
     if data is not None:
         channel.send(data)
     channel.shutdown_write()
-    return_code, out, err = drain_ssh_channel(channel, **(show_output and {} or {'stdout': None, 'stderr': None}))
+    return_code, out, err = drain_ssh_channel(
+        channel,
+        output_callback=output_callback,
+        **(show_output and {} or {'stdout': None, 'stderr': None}),
+    )
     channel.close()
-    transport.close()
-    client.close()
+    if client is not None:
+        client.close()
 
     LOGGER.debug(
         'Command %s on %s returned with %d',
@@ -87,89 +110,149 @@ def ssh(
     return command_status.CommandStatus(out, err, return_code)
 
 
-def drain_ssh_channel(chan, stdin=None, stdout=sys.stdout, stderr=sys.stderr):
+def drain_ssh_channel(chan, stdin=None, stdout=sys.stdout, stderr=sys.stderr, output_callback=None, collect=True):
+    """
+    Forward data between the channel and the local streams until the command
+    running on the channel exits
+
+    :param output_callback: called with ('stdout'|'stderr', bytes) for every
+     chunk of output as soon as it's received
+    :param collect: if False, the output isn't kept and empty output is
+     returned - use with 'output_callback' for outputs too big to keep
+    :returns: (exit status, stdout bytes, stderr bytes)
+    """
     chan.settimeout(0)
-    out_queue = []
-    out_all = []
-    err_queue = []
-    err_all = []
+    out_queue = collections.deque()
+    err_queue = collections.deque()
+    out_all = bytearray()
+    err_all = bytearray()
+    sources = [
+        (chan.recv, out_queue if stdout else None, out_all, 'stdout'),
+        (chan.recv_stderr, err_queue if stderr else None, err_all, 'stderr'),
+    ]
 
-    try:
-        stdout_is_tty = stdout.isatty()
-        tty_w = tty_h = -1
-    except AttributeError:
-        stdout_is_tty = False
-
-    done = False
-    while not done:
-        if stdout_is_tty:
-            arr = array.array('h', range(4))
-            if not fcntl.ioctl(stdout.fileno(), termios.TIOCGWINSZ, arr):
-                if tty_h != arr[0] or tty_w != arr[1]:
-                    tty_h, tty_w = arr[:2]
-                    chan.resize_pty(width=tty_w, height=tty_h)
-
-        read_streams = []
-        if not chan.closed:
-            read_streams.append(chan)
-
-            if stdin and not stdin.closed:
-                read_streams.append(stdin)
-
-        write_streams = []
-        if stdout and out_queue:
-            write_streams.append(stdout)
-        if stderr and err_queue:
-            write_streams.append(stderr)
-
-        read, write, _ = select.select(
-            read_streams,
-            write_streams,
-            [],
-            0.1,
-        )
+    with _forwarded_window_size(chan, stdout) as update_window_size:
+        stdin_open = stdin is not None and not stdin.closed
+        chan_eof = False
+        while not chan_eof or out_queue or err_queue:
+            update_window_size()
+
+            read_streams = []
+            if not chan_eof:
+                read_streams.append(chan)
+                if stdin_open:
+                    read_streams.append(stdin)
+
+            write_streams = []
+            if out_queue:
+                write_streams.append(stdout)
+            if err_queue:
+                write_streams.append(stderr)
+
+            read, write, _ = select.select(read_streams, write_streams, [], _DRAIN_POLL_INTERVAL)
 
-        if stdin in read:
-            chunk = utils.read_nonblocking(stdin)
-            if chunk:
-                chan.send(chunk)
-            else:
-                chan.shutdown_write()
+            if stdin_open and stdin in read:
+                chunk = utils.read_nonblocking(stdin)
+                if chunk:
+                    chan.sendall(chunk)
+                else:
+                    chan.shutdown_write()
+                    stdin_open = False
 
+            if chan in read or chan.closed:
+                # a list, not a generator - both stdout and stderr have to
+                # be drained, even when the first one isn't at EOF yet
+                sources_eof = [
+                    _drain_source(*source, output_callback=output_callback, collect=collect) for source in sources
+                ]
+                chan_eof = all(sources_eof)
+
+            if stdout in write:
+                _write_queued(stdout, out_queue)
+            if stderr in write:
+                _write_queued(stderr, err_queue)
+
+    return (chan.recv_exit_status(), bytes(out_all), bytes(err_all))
+
+
+# 'select' on a channel wakes up as soon as there's data, this is only
+# a safety net, i.e. for the channel closing without sending EOF
+_DRAIN_POLL_INTERVAL = 1
+_DRAIN_CHUNK_SIZE = 64 * 1024
+
+
+def _drain_source(recv, queue, collected, name, output_callback, collect):
+    """Read everything that's buffered, returns True on EOF"""
+    while True:
         try:
-            if chan.recv_ready():
-                chunk = chan.recv(1024)
-                if stdout:
-                    out_queue.append(chunk)
-                out_all.append(chunk)
-
-            if chan.recv_stderr_ready():
-                chunk = chan.recv_stderr(1024)
-                if stderr:
-                    err_queue.append(chunk)
-                err_all.append(chunk)
+            chunk = recv(_DRAIN_CHUNK_SIZE)
+        except socket.timeout:
+            return False
         except socket.error:
-            pass
+            return True
+        if not chunk:
+            return True
+        if queue is not None:
+            queue.append(chunk)
+        if collect:
+            collected += chunk
+        if output_callback is not None:
+            output_callback(name, chunk)
+
+
+def _write_queued(stream, queue):
+    data = b''.join(queue)
+    queue.clear()
+    binary_stream = getattr(stream, 'buffer', stream)
+    try:
+        binary_stream.write(data)
+    except TypeError:
+        stream.write(data.decode('utf-8', errors='replace'))
+    else:
+        if binary_stream is not stream:
+            binary_stream.flush()
+    stream.flush()
+
+
+@contextlib.contextmanager
+def _forwarded_window_size(chan, stdout):
+    """Keep the remote pty size in sync with the local terminal
 
-        if stdout in write:
-            out = out_queue.pop(0)
-            try:
-                stdout.write(out)
-            except TypeError:
-                stdout.write(out.decode('utf-8'))
-            stdout.flush()
-        if stderr in write:
-            err = err_queue.pop(0)
-            try:
-                stderr.write(err)
-            except TypeError:
-                stderr.write(err.decode('utf-8'))
-            stderr.flush()
+    The size is set once, then only after the terminal tells us it changed
+    with SIGWINCH. The handler only flags the change - the channel must not
+    be used from a signal handler - and the yielded callable applies it.
+    Signal handlers can only be set in the main thread, elsewhere the size
+    is only set once.
+    """
+    try:
+        stdout_fd = stdout.fileno() if stdout and stdout.isatty() else None
+    except (AttributeError, ValueError, io.UnsupportedOperation):
+        stdout_fd = None
+    if stdout_fd is None:
+        yield lambda: None
+        return
 
-        if chan.closed and not out_queue and not err_queue:
-            done = True
+    resized = threading.Event()
 
-    return (chan.exit_status, b''.join(out_all), b''.join(err_all))
+    def update_window_size():
+        if not resized.is_set():
+            return
+        resized.clear()
+        arr = array.array('h', range(4))
+        if not fcntl.ioctl(stdout_fd, termios.TIOCGWINSZ, arr):
+            chan.resize_pty(width=arr[1], height=arr[0])
+
+    resized.set()
+    update_window_size()
+    if threading.current_thread() is not threading.main_thread():
+        yield lambda: None
+        return
+
+    previous_handler = signal.signal(signal.SIGWINCH, lambda *_: resized.set())
+    try:
+        yield update_window_size
+    finally:
+        signal.signal(signal.SIGWINCH, previous_handler)
 
 
 def _gen_ssh_command_id():
@@ -251,3 +334,99 @@ def get_ssh_client(
 
 class OSTSSHTimeoutException(Exception):
     pass
+
+
+class _PooledConnection:
+    def __init__(self, client):
+        self.client = client
+        self.last_checked = time.monotonic()
+
+    def is_alive(self):
+        transport = self.client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        if time.monotonic() - self.last_checked < SSH_POOL_HEALTH_CHECK_INTERVAL:
+            return True
+        # is_active() doesn't notice a peer that went away silently,
+        # sending something does
+        try:
+            transport.send_ignore()
+        except (EOFError, socket.error, paramiko.ssh_exception.SSHException):
+            return False
+        self.last_checked = time.monotonic()
+        return True
+
+
+class SSHConnectionPool:
+    """
+    Keeps ssh connections open, so they can be reused by later commands
+
+    There's one connection per (ip address, username, ssh key), shared by all
+    the threads - paramiko can run many channels over a single transport
+    at the same time. Connections that were idle for a while are checked
+    before they're handed out and replaced when they're dead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connections = {}
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0, 'channels': 0}
+
+    def open_session(self, ip_addr, ssh_key=None, username='root', **connect_args):
+        key = (ip_addr, username, tuple(ssh_key) if isinstance(ssh_key, list) else ssh_key)
+        connection = self._get(key, ip_addr=ip_addr, ssh_key=ssh_key, username=username, **connect_args)
+        try:
+            channel = connection.client.get_transport().open_session()
+        except (EOFError, socket.error, paramiko.ssh_exception.SSHException) as err:
+            LOGGER.debug('Pooled ssh connection to %s failed, reconnecting: %s', ip_addr, err)
+            self._evict(key, connection)
+            connection = self._get(key, ip_addr=ip_addr, ssh_key=ssh_key, username=username, **connect_args)
+            channel = connection.client.get_transport().open_session()
+        with self._lock:
+            self._stats['channels'] += 1
+        return channel
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, connections=len(self._connections))
+
+    def close_all(self):
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for connection in connections:
+            connection.client.close()
+
+    def _get(self, key, **connect_args):
+        with self._lock:
+            connection = self._connections.get(key)
+            if connection is not None:
+                if connection.is_alive():
+                    self._stats['hits'] += 1
+                    return connection
+                self._stats['stale'] += 1
+                del self._connections[key]
+                connection.client.close()
+            self._stats['misses'] += 1
+        # connecting may take long, don't block other endpoints meanwhile
+        connection = _PooledConnection(get_ssh_client(**connect_args))
+        with self._lock:
+            existing = self._connections.setdefault(key, connection)
+        if existing is not connection:
+            # another thread connected in the meantime
+            connection.client.close()
+        return existing
+
+    def _evict(self, key, connection):
+        with self._lock:
+            if self._connections.get(key) is connection:
+                del self._connections[key]
+                self._stats['stale'] += 1
+        connection.client.close()
+
+
+_pool = SSHConnectionPool()
+
+
+def connection_pool():
+    return _pool
@@ -0,0 +1,188 @@
+#
+# Copyright oVirt Authors
+# SPDX-License-Identifier: GPL-2.0-or-later
+#
+#
+
+import collections
+import concurrent.futures
+import logging
+import threading
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 2
+
+
+def status_is(expected_status, attribute='status'):
+    return lambda entity: entity is not None and getattr(entity, attribute) == expected_status
+
+
+class Watch:
+    """A registered wait for an entity, see StatusPoller.watch"""
+
+    def __init__(self, kind, entity_id, predicate, description=None):
+        self.kind = kind
+        self.entity_id = entity_id
+        self.description = description or f'{kind} {entity_id}'
+        self.entity = None
+        self.polls = 0
+        self._predicate = predicate
+        # done once the predicate is true, or raised
+        self._outcome = concurrent.futures.Future()
+
+    @property
+    def satisfied(self):
+        return self._outcome.done() and self._outcome.exception() is None
+
+    def wait(self, timeout=None):
+        """Returns True if the predicate became true within 'timeout' seconds
+
+        Exceptions raised by the predicate are raised here.
+        """
+        try:
+            return self._outcome.result(timeout)
+        except concurrent.futures.TimeoutError:
+            return False
+
+    def _check(self, entity):
+        if self._outcome.done():
+            return
+        self.entity = entity
+        self.polls += 1
+        try:
+            if self._predicate(entity):
+                self._outcome.set_result(True)
+        except Exception as e:
+            self._outcome.set_exception(e)
+
+    def __bool__(self):
+        return self.satisfied
+
+    def __repr__(self):
+        state = 'satisfied' if self.satisfied else 'not satisfied'
+        return f'<Watch {self.description}: {state} after {self.polls} polls, last seen {self.entity!r}>'
+
+
+class StatusPoller:
+    """
+    Waits for engine entities in one background thread shared by all waits
+
+    Instead of every wait fetching its own entity over and over, waits
+    register a watch with the poller. On every tick, the poller lists each
+    kind of entity that's being watched once and checks the predicates of
+    all the watches of that kind against the listed entities. The predicate
+    gets None if the entity wasn't listed, i.e. it's been removed.
+
+        poller = StatusPoller(system_service)
+        assert poller.equals_within('disk', disk_id, types.DiskStatus.OK, timeout=180)
+
+    The poller should have a connection of its own, ovirtsdk4 connections
+    must not be used from several threads at once.
+    """
+
+    def __init__(self, system_service, interval=DEFAULT_INTERVAL):
+        self._list_entities = {
+            'disk': lambda: system_service.disks_service().list(),
+            'host': lambda: system_service.hosts_service().list(),
+            'storage_domain': lambda: system_service.storage_domains_service().list(),
+            'template': lambda: system_service.templates_service().list(),
+            'vm': lambda: system_service.vms_service().list(),
+        }
+        self._interval = interval
+        self._cond = threading.Condition()
+        self._watches = []
+        self._stopped = False
+        self._thread = None
+        self.list_calls = collections.Counter()
+
+    def watch(self, kind, entity_id, predicate, description=None):
+        """Registers a watch, checked on the next tick and after that on every tick until it's unwatched"""
+        if kind not in self._list_entities:
+            raise ValueError(f'Unknown entity kind {kind}, expected one of {sorted(self._list_entities)}')
+        watch = Watch(kind, entity_id, predicate, description)
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError('StatusPoller is stopped')
+            self._watches.append(watch)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='status-poller', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return watch
+
+    def unwatch(self, watch):
+        with self._cond:
+            if watch in self._watches:
+                self._watches.remove(watch)
+
+    def wait_for(self, kind, entity_id, predicate, timeout, description=None):
+        """Waits until 'predicate(entity)' is true, returns the watch - true if it did"""
+        watch = self.watch(kind, entity_id, predicate, description)
+        self.wait_all([watch], timeout)
+        return watch
+
+    def wait_all(self, watches, timeout):
+        """Waits for all the watches within a common timeout and unwatches them
+
+        Returns True if all of them were satisfied.
+        """
+        deadline = time.monotonic() + timeout
+        try:
+            for watch in watches:
+                watch.wait(max(deadline - time.monotonic(), 0))
+        finally:
+            for watch in watches:
+                self.unwatch(watch)
+        return all(watches)
+
+    def equals_within(self, kind, entity_id, expected_status, timeout, attribute='status'):
+        return self.wait_for(
+            kind,
+            entity_id,
+            status_is(expected_status, attribute),
+            timeout,
+            description=f'{kind} {entity_id} {attribute} == {expected_status}',
+        )
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        LOGGER.debug(f'StatusPoller: list calls made: {dict(self.list_calls)}')
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._watches and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                watches = list(self._watches)
+
+            tick_start = time.monotonic()
+            self._poll(watches)
+
+            with self._cond:
+                # new watches wake us up early, so they're checked right away
+                self._cond.wait(max(self._interval - (time.monotonic() - tick_start), 0))
+
+    def _poll(self, watches):
+        watches_by_kind = collections.defaultdict(list)
+        for watch in watches:
+            watches_by_kind[watch.kind].append(watch)
+
+        for kind, kind_watches in watches_by_kind.items():
+            try:
+                entities = self._list_entities[kind]()
+            except Exception as e:
+                LOGGER.warning(f'StatusPoller: listing {kind}s failed, will retry: {e}')
+                continue
+            self.list_calls[kind] += 1
+            entities_by_id = {entity.id: entity for entity in entities}
+            for watch in kind_watches:
+                watch._check(entities_by_id.get(watch.entity_id))
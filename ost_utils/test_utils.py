@@ -4,13 +4,18 @@
 #
 #
 
-from functools import cache
-
 import ovirtsdk4
 import ovirtsdk4.types as types
 
+from ost_utils import entity_resolver
+
+_resolver = entity_resolver.EntityResolver()
+
+
+def resolver_stats():
+    return _resolver.counts()
+
 
-@cache
 def get_nics_service(engine, vm_name):
     vm_service = get_vm_service(engine, vm_name)
     nics_service = vm_service.nics_service()
@@ -23,23 +28,14 @@ def get_network_fiter_parameters_service(engine, vm_name):
     return nics_service.nic_service(id=nic.id).network_filter_parameters_service()
 
 
-@cache
 def get_vm_service(engine, vm_name):
-    vms_service = engine.vms_service()
-    vm = vms_service.list(search='name={}'.format(vm_name))[0]
-    if vm is None:
-        return None
-    return vms_service.vm_service(vm.id)
+    return _resolver.service(engine, 'vms', vm_name)
 
 
-@cache
 def get_disk_service(engine, disk_name):
-    disks_service = engine.disks_service()
-    disk = disks_service.list(search='name={}'.format(disk_name))[0]
-    return disks_service.disk_service(disk.id)
+    return _resolver.service(engine, 'disks', disk_name)
 
 
-@cache
 def get_disk_attachments_service(engine, vm_name):
     vm_service = get_vm_service(engine, vm_name)
     if vm_service is None:
@@ -47,63 +43,37 @@ def get_disk_attachments_service(engine, vm_name):
     return vm_service.disk_attachments_service()
 
 
-@cache
 def get_template_service(engine, template_name):
-    templates_service = engine.templates_service()
-    template = templates_service.list(search=f'name={template_name}')[0]
-    if template is None:
-        return None
-    return templates_service.template_service(template.id)
+    return _resolver.service(engine, 'templates', template_name)
 
 
-@cache
 def get_pool_service(engine, pool_name):
-    vm_pools_service = engine.vm_pools_service()
-    pool = vm_pools_service.list(search='name={}'.format(pool_name))[0]
-    return vm_pools_service.pool_service(pool.id)
+    return _resolver.service(engine, 'vm_pools', pool_name)
 
 
-@cache
 def get_storage_domain_service(engine, sd_name):
-    storage_domains_service = engine.storage_domains_service()
-    sd = storage_domains_service.list(search='name={}'.format(sd_name))[0]
-    return storage_domains_service.storage_domain_service(sd.id)
+    return _resolver.service(engine, 'storage_domains', sd_name)
 
 
 def get_storage_domain_vm_service_by_name(sd_service, vm_name):
-    vms_service = sd_service.vms_service()
-    # StorageDomainVmsService.list has no 'search' parameter and ignores
-    # query={'name': 'spam'} so we have to do the filtering ourselves
-    vm = next((vm for vm in vms_service.list() if vm.name == vm_name), None)
-    if vm is None:
-        return None
-    else:
-        return vms_service.vm_service(vm.id)
+    return get_storage_domain_vm_service_by_query(sd_service, vm_name)
 
 
 def get_storage_domain_vm_service_by_query(sd_service, vm_name, query=None):
-    vms_service = sd_service.vms_service()
     # StorageDomainVmsService.list has no 'search' parameter and ignores
-    # query={'name': 'spam'} so we have to do the filtering ourselves
-    vm = next(
-        (vm for vm in vms_service.list(query=query) if vm.name == vm_name),
-        None,
-    )
-    if vm is None:
+    # query={'name': 'spam'}, the resolver indexes the names of a listing
+    try:
+        return _resolver.service_in(sd_service.vms_service(), 'vm_service', vm_name, query)
+    except LookupError:
         return None
-    else:
-        return vms_service.vm_service(vm.id)
 
 
 def get_storage_domain_disk_service_by_name(sd_service, disk_name):
-    disks_service = sd_service.disks_service()
-    # StorageDomainDisksService.list has no 'search' parameter and ignores
-    # query={'name': 'spam'} so we have to do the filtering ourselves
-    disk = next((disk for disk in disks_service.list() if disk.name == disk_name), None)
-    if disk is None:
+    # StorageDomainDisksService.list has no 'search' parameter either
+    try:
+        return _resolver.service_in(sd_service.disks_service(), 'disk_service', disk_name)
+    except LookupError:
         return None
-    else:
-        return disks_service.disk_service(disk.id)
 
 
 def hosts_in_cluster_v4(root, cluster_name):
@@ -111,21 +81,14 @@ def hosts_in_cluster_v4(root, cluster_name):
     return sorted(hosts, key=lambda host: host.name)
 
 
-@cache
 def data_center_service(root, name):
-    data_centers = root.data_centers_service()
-    dc = data_centers.list(search='name={}'.format(name))[0]
-    return data_centers.data_center_service(dc.id)
+    return _resolver.service(root, 'data_centers', name)
 
 
-@cache
 def get_cluster_service(engine, cluster_name):
-    clusters_service = engine.clusters_service()
-    cluster = clusters_service.list(search='name={}'.format(cluster_name))[0]
-    return clusters_service.cluster_service(cluster.id)
+    return _resolver.service(engine, 'clusters', cluster_name)
 
 
-@cache
 def get_vm_snapshots_service(engine, vm_name):
     vm_service = get_vm_service(engine, vm_name)
     if vm_service is None:
@@ -152,11 +115,8 @@ def quote_search_string(s):
     return '"' + s + '"'
 
 
-@cache
 def get_vnic_profiles_service(engine, network_name):
-    networks_service = engine.networks_service()
-    net = networks_service.list(search='name={}'.format(network_name))[0]
-    return networks_service.network_service(net.id).vnic_profiles_service()
+    return _resolver.service(engine, 'networks', network_name).vnic_profiles_service()
 
 
 def all_jobs_finished(engine, correlation_id):
@@ -173,14 +133,12 @@ def get_first_active_host_by_name(engine):
 
 
 def get_attached_storage_domain(data_center, name, service=False):
-    storage_domains_service = data_center.storage_domains_service()
     # AttachedStorageDomainsService.list doesn't have the 'search' parameter
-    # (StorageDomainsService.list does but this helper is overloaded)
-    sd = next(sd for sd in storage_domains_service.list() if sd.name == name)
-    return storage_domains_service.storage_domain_service(sd.id) if service else sd
+    # (StorageDomainsService.list does but this helper is overloaded),
+    # raises LookupError if there's no such storage domain
+    sd_service = _resolver.service_in(data_center.storage_domains_service(), 'storage_domain_service', name)
+    return sd_service if service else sd_service.get()
 
 
 def get_attached_storage_domain_disk_service(attached_storage, name, query=None):
-    disks_service = attached_storage.disks_service()
-    disk = next(disk for disk in disks_service.list(query=query) if disk.name == name)
-    return disks_service.disk_service(disk.id)
+    return _resolver.service_in(attached_storage.disks_service(), 'disk_service', name, query)